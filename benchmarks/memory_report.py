@@ -0,0 +1,77 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "src"))
+import pandas as pd
+import streamlit as st
+import streamlit.logger
+import config
+import data_loader
+from synthetic_data import SCALES, write_synthetic_dataset
+
+st.config.set_option("logger.level", "error")
+streamlit.logger.set_log_level("error")
+
+# Laporan memori per kolom untuk frame dominance dan tabel: skema asli (string object, int64, float64)
+# dibandingkan dengan skema ringkas yang disimpan di store (data_loader.compact_frame).
+def column_report(df_before, df_after):
+    before = data_loader.memory_by_column(df_before)
+    after = data_loader.memory_by_column(df_after)
+    report = pd.DataFrame({
+        "dtype_before": df_before.dtypes.astype(str),
+        "bytes_before": before,
+        "dtype_after": df_after.dtypes.astype(str),
+        "bytes_after": after,
+    })
+    report.loc["TOTAL"] = ["", before.sum(), "", after.sum()]
+    report["ratio"] = (report["bytes_after"] / report["bytes_before"]).round(3)
+    return report
+
+def print_reports(reporter_pair):
+    df_dominance, _ = data_loader.compute_trade_data(reporter_pair)
+    if df_dominance.empty:
+        print("No trade data available.", file=sys.stderr)
+        return 1
+    df_table = data_loader.prepare_table_data(df_dominance)
+    df_dominance_compact = data_loader.compact_frame(df_dominance)
+    df_table_compact = data_loader.compact_frame(data_loader.prepare_table_data(df_dominance_compact))
+
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        for name, before, after in (
+            ("dominance", df_dominance, df_dominance_compact),
+            ("table", df_table, df_table_compact),
+        ):
+            print(f"[{name}] {len(before):,} rows")
+            print(column_report(before, after).to_string())
+            print()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Print bytes per column of the dominance and table frames before and after compaction.")
+    parser.add_argument("--scale", choices=list(SCALES), help="Use a synthetic dataset of this scale instead of the real data.")
+    args = parser.parse_args()
+
+    os.chdir(REPO_DIR)
+    if args.scale is None:
+        return print_reports(config.DEFAULT_REPORTER_PAIR)
+
+    partner_factor, year_factor = SCALES[args.scale]
+    work_dir = tempfile.mkdtemp(prefix=f"trade-memory-{args.scale}-")
+    original_paths = (config.TRADE_DATA_PATH, config.CACHE_DIR)
+    try:
+        data_dir = os.path.join(work_dir, "trade_data")
+        write_synthetic_dataset(data_dir, config.COUNTRY_DIMENSION_PATH, partner_factor, year_factor)
+        config.TRADE_DATA_PATH = data_dir
+        config.CACHE_DIR = os.path.join(work_dir, "cache")
+        return print_reports(config.DEFAULT_REPORTER_PAIR)
+    finally:
+        config.TRADE_DATA_PATH, config.CACHE_DIR = original_paths
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "src"))
+import streamlit as st
+import streamlit.logger
+import config
+import data_loader
+from components import map_plotter, line_chart_plotter, table_plotter
+from components.figure_cache import clear_figure_cache
+from synthetic_data import SCALES, write_synthetic_dataset
+
+# Tanpa runtime Streamlit setiap pemanggilan cache mencetak peringatan; cukup tampilkan error.
+st.config.set_option("logger.level", "error")
+streamlit.logger.set_log_level("error")
+
+# Benchmark pipeline data dan figure pada data sintetis. Setiap pengukuran dimulai dingin: cache Streamlit,
+# cache disk, dan cache figure/glyph dikosongkan. Hasil disimpan sebagai baseline JSON per skala.
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+REGRESSION_THRESHOLD = 1.25 # Rasio waktu/memori terhadap baseline yang dilaporkan sebagai regresi
+# Selisih absolut di bawah ini bukan regresi walaupun rasionya besar: fungsi yang hanya beberapa milidetik
+# (atau beberapa ratus KB) mudah berubah 1.5x karena noise mesin saja.
+REGRESSION_MIN_DELTA = {"wall_time_min_s": 0.02, "peak_memory_mb": 0.5, "output_bytes": 0}
+DEFAULT_REPEATS = 7
+
+def clear_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    clear_figure_cache()
+    table_plotter.get_proportion_glyph_svg.cache_clear()
+    shutil.rmtree(config.CACHE_DIR, ignore_errors=True)
+
+def check_cube_cache_round_trip():
+    # Cube yang baru dibangun harus terbaca kembali dari cache .npz (tanpa pickle) dengan isi yang sama;
+    # jika tidak, setiap proses baru diam-diam membangun ulang cube dari file data.
+    clear_caches()
+    cube = data_loader.get_trade_cube()
+    cached_arrays = data_loader.read_cached_arrays("cube", data_loader.trade_data_cache_key())
+    if cached_arrays is None or any(
+        not np.array_equal(cached_arrays.get(field), getattr(cube, field)) for field in data_loader.TradeCube._fields
+    ):
+        raise RuntimeError("The trade cube does not round-trip through its .npz cache.")
+    clear_caches()
+
+def figure_size(fig):
+    return len(fig.to_json().encode("utf-8"))
+
+def build_cases():
+    # Setiap case: (nama, setup yang tidak diukur, fungsi yang diukur -> ukuran output dalam byte atau None).
+    def setup_computed():
+        df_dominance, available_years = data_loader.compute_trade_data()
+        return {"df_dominance": df_dominance, "available_years": available_years}
+
+    def setup_loaded():
+        df_dominance, available_years = data_loader.load_trade_data()
+        df_table = data_loader.prepare_table_data(df_dominance)
+        table_index = data_loader.prepare_table_index(df_table)
+        year = available_years[-1]
+        df_top_n = data_loader.get_top_partners(df_table, table_index, year, "Total", "World")
+        return {
+            "df_dominance": df_dominance, "available_years": available_years, "df_top_n": df_top_n,
+            "geojson": data_loader.get_geojson_for_view("World"), "year": year,
+        }
+
+    def run_compute_trade_data(_):
+        data_loader.compute_trade_data()
+
+    def run_build_trade_store(inputs):
+        data_loader.build_trade_store(inputs["df_dominance"], inputs["available_years"])
+
+    def run_prepare_table_data(inputs):
+        data_loader.prepare_table_data(inputs["df_dominance"])
+
+    def run_load_line_chart_data(_):
+        line_chart_plotter.load_line_chart_data()
+
+    def run_create_choropleth_map(inputs):
+        years = inputs["available_years"]
+        return figure_size(map_plotter.create_choropleth_map(
+            inputs["df_dominance"], years, inputs["geojson"], min(years), max(years),
+            current_selected_year=inputs["year"], selected_flow_key="Total", selected_continent="World"
+        ))
+
+    def setup_trend():
+        return {"df_trend": line_chart_plotter.load_line_chart_data()}
+
+    def run_create_trade_trend_line_chart(inputs):
+        return figure_size(line_chart_plotter.create_trade_trend_line_chart(inputs["df_trend"]))
+
+    def run_generate_trade_table_data_and_pies(inputs):
+        _, pie_glyphs = table_plotter.generate_trade_table_data_and_pies(inputs["df_top_n"])
+        return sum(len(glyph.encode("utf-8")) for glyph in pie_glyphs)
+
+    def run_generate_trade_table_html(inputs):
+        return len(table_plotter.generate_trade_table_html(inputs["df_top_n"]).encode("utf-8"))
+
+    return [
+        ("compute_trade_data", lambda: None, run_compute_trade_data),
+        ("build_trade_store", setup_computed, run_build_trade_store),
+        ("prepare_table_data", setup_loaded, run_prepare_table_data),
+        ("load_line_chart_data", lambda: None, run_load_line_chart_data),
+        ("create_choropleth_map", setup_loaded, run_create_choropleth_map),
+        ("create_trade_trend_line_chart", setup_trend, run_create_trade_trend_line_chart),
+        ("generate_trade_table_data_and_pies", setup_loaded, run_generate_trade_table_data_and_pies),
+        ("generate_trade_table_html", setup_loaded, run_generate_trade_table_html),
+    ]
+
+def prepare_inputs(setup):
+    clear_caches()
+    inputs = setup()
+    # Setup ikut mengisi cache; dikosongkan lagi agar fungsi yang diukur tetap berjalan dingin.
+    clear_caches()
+    return inputs
+
+def measure(setup, run, repeats):
+    wall_times = []
+    output_bytes = None
+    for _ in range(repeats):
+        inputs = prepare_inputs(setup)
+        start = time.perf_counter()
+        output_bytes = run(inputs)
+        wall_times.append(time.perf_counter() - start)
+
+    # Memori puncak diukur di putaran terpisah karena tracemalloc memperlambat eksekusi.
+    inputs = prepare_inputs(setup)
+    tracemalloc.start()
+    run(inputs)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_time_s": round(statistics.median(wall_times), 6),
+        "wall_time_min_s": round(min(wall_times), 6),
+        "peak_memory_mb": round(peak_bytes / 1024 ** 2, 3),
+        "output_bytes": output_bytes,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_scale(scale, repeats):
+    partner_factor, year_factor = SCALES[scale]
+    work_dir = tempfile.mkdtemp(prefix=f"trade-benchmark-{scale}-")
+    original_paths = (config.TRADE_DATA_PATH, config.CACHE_DIR)
+    try:
+        data_dir = os.path.join(work_dir, "trade_data")
+        n_rows, n_columns = write_synthetic_dataset(
+            data_dir, os.path.join(REPO_DIR, config.COUNTRY_DIMENSION_PATH), partner_factor, year_factor
+        )
+        config.TRADE_DATA_PATH = data_dir
+        config.CACHE_DIR = os.path.join(work_dir, "cache")
+        check_cube_cache_round_trip()
+
+        results = {}
+        for name, setup, run in build_cases():
+            results[name] = measure(setup, run, repeats)
+            print(f"  {scale:>5} {name:<36} {results[name]['wall_time_min_s']:>9.4f}s min "
+                  f"{results[name]['peak_memory_mb']:>9.1f} MB  output={results[name]['output_bytes']}")
+    finally:
+        config.TRADE_DATA_PATH, config.CACHE_DIR = original_paths
+        clear_caches()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "scale": scale,
+        "dataset": {"rows": n_rows, "year_columns": n_columns - 3, "partner_factor": partner_factor, "year_factor": year_factor},
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "results": results,
+    }
+
+def compare_with_baseline(report, baseline):
+    regressions = []
+    for name, result in report["results"].items():
+        baseline_result = baseline.get("results", {}).get(name)
+        if baseline_result is None:
+            continue
+        # Waktu dibandingkan lewat putaran tercepat (min-of-N): noise mesin hanya bisa menambah waktu, jadi
+        # minimum jauh lebih stabil daripada median.
+        for metric in ("wall_time_min_s", "peak_memory_mb", "output_bytes"):
+            old, new = baseline_result.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            is_regression = ratio > REGRESSION_THRESHOLD and new - old > REGRESSION_MIN_DELTA[metric]
+            flag = "  <-- regression" if is_regression else ""
+            print(f"  {name:<36} {metric:<15} {old:>12} -> {new:<12} x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append((name, metric, ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the trade data and figure pipeline on synthetic data.")
+    parser.add_argument("--scales", nargs="+", default=["1x", "10x", "100x"], choices=list(SCALES))
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--save", action="store_true", help="Overwrite the JSON baselines with this run.")
+    args = parser.parse_args()
+
+    os.chdir(REPO_DIR)
+    any_regression = False
+    for scale in args.scales:
+        print(f"[{scale}]")
+        report = run_scale(scale, args.repeats)
+        baseline_path = os.path.join(BASELINE_DIR, f"{scale}.json")
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding="utf-8") as f:
+                baseline = json.load(f)
+            print(f"  compared with baseline from commit {baseline.get('commit')}:")
+            any_regression |= bool(compare_with_baseline(report, baseline))
+        if args.save:
+            os.makedirs(BASELINE_DIR, exist_ok=True)
+            with open(baseline_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+    return 1 if any_regression and not args.save else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
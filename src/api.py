@@ -0,0 +1,179 @@
+import hashlib
+import json
+import math
+import threading
+import streamlit as st
+import streamlit.logger
+
+# Fungsi data_loader memakai cache Streamlit; di luar runtime Streamlit peringatannya cukup disembunyikan.
+st.config.set_option("logger.level", "error")
+streamlit.logger.set_log_level("error")
+
+from flask import Flask, Response, request
+from werkzeug.exceptions import BadRequest, HTTPException, NotFound
+import config
+import data_loader
+
+# API JSON read-only di atas output data_loader (dijalankan dari root repo: python src/api.py).
+# Semua body respons dihitung sekali per versi data beserta ETag kuatnya (hash isi body), sehingga
+# setiap request hanya berupa lookup dict; klien yang mengirim If-None-Match yang cocok mendapat 304.
+app = Flask(__name__)
+
+ORDER_OPTIONS = {"desc": "Descending", "asc": "Ascending"}
+
+response_store = {"data_version": None, "responses": {}}
+response_store_lock = threading.Lock()
+
+def number_or_none(value):
+    # NaN/inf bukan JSON yang valid.
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+def precomputed_response(payload):
+    body = json.dumps(payload, separators=(',', ':'), allow_nan=False).encode("utf-8")
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+def dominance_records(df_group, country_dimension, reporter_pair):
+    country_codes = df_group['Country_Code'].to_numpy()
+    return [
+        {
+            "partner": partner,
+            "iso3": country_dimension.iso3[code] if code >= 0 else None,
+            "ratio": number_or_none(ratio),
+            "reporter_a_trade": number_or_none(a_trade),
+            "reporter_b_trade": number_or_none(b_trade),
+        }
+        for partner, code, ratio, a_trade, b_trade in zip(
+            df_group['Partner'], country_codes, data_loader.full_precision_ratio(df_group, reporter_pair),
+            df_group['Reporter_A_Trade'], df_group['Reporter_B_Trade']
+        )
+    ]
+
+def top_partner_records(df_top_n, reporter_pair):
+    return [
+        {
+            "rank": rank,
+            "partner": partner,
+            "continent_code": continent_code,
+            "reporter_a_trade": number_or_none(a_trade),
+            "reporter_b_trade": number_or_none(b_trade),
+            "total_pair_trade": number_or_none(total),
+            "ratio": number_or_none(ratio),
+        }
+        for rank, (partner, continent_code, a_trade, b_trade, total, ratio) in enumerate(zip(
+            df_top_n['Partner'], df_top_n['Continent_Code'], df_top_n['Reporter_A_Trade'],
+            df_top_n['Reporter_B_Trade'], df_top_n['Total_Pair_Trade'], data_loader.full_precision_ratio(df_top_n, reporter_pair)
+        ), start=1)
+    ]
+
+def build_responses(reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    df_dominance, available_years = data_loader.load_trade_data(reporter_pair)
+    if df_dominance.empty or not available_years:
+        return {}
+    reporters = {"reporter_a": reporter_pair[0], "reporter_b": reporter_pair[1]}
+    flow_keys = list(config.TRADE_FLOW_MAP.values())
+    responses = {}
+
+    responses[("meta",)] = precomputed_response({
+        **reporters,
+        "years": [int(year) for year in available_years],
+        "flows": flow_keys,
+        "continents": list(config.CONTINENT_OPTIONS.values()),
+        "orders": list(ORDER_OPTIONS),
+        "top_n": config.TOP_N_COUNTRIES,
+        "ratio": "reporter_b_trade / (reporter_a_trade + reporter_b_trade)",
+    })
+
+    country_dimension = data_loader.get_country_dimension()
+    for (year, flow_key), df_group in df_dominance.groupby(['Year', 'Trade_Flow_Type'], sort=False, observed=True):
+        responses[("dominance", int(year), flow_key)] = precomputed_response({
+            **reporters, "year": int(year), "flow": flow_key,
+            "partners": dominance_records(df_group, country_dimension, reporter_pair),
+        })
+
+    df_table, table_index = data_loader.load_table_data(reporter_pair)
+    for year in available_years:
+        for flow_key in flow_keys:
+            for continent_code in config.CONTINENT_OPTIONS.values():
+                for order, sort_order in ORDER_OPTIONS.items():
+                    df_top_n = data_loader.get_top_partners(
+                        df_table, table_index, year=year, flow_key=flow_key, continent_code=continent_code,
+                        ascending=(sort_order == "Ascending"), top_n=config.TOP_N_COUNTRIES
+                    )
+                    responses[("top_partners", int(year), flow_key, continent_code, order)] = precomputed_response({
+                        **reporters, "year": int(year), "flow": flow_key, "continent": continent_code, "order": order,
+                        "partners": top_partner_records(df_top_n, reporter_pair),
+                    })
+
+    cube = data_loader.get_trade_cube()
+    if cube is not None:
+        df_trend = data_loader.compute_trend_frame(cube, reporter_pair)
+        responses[("trend",)] = precomputed_response({
+            **reporters,
+            "series": [
+                {
+                    "reporter": reporter, "trade_type": trade_type,
+                    "years": [int(year) for year in df_series['Year']],
+                    "values": [number_or_none(value) for value in df_series['Value']],
+                }
+                for (reporter, trade_type), df_series in df_trend.groupby(['Country', 'Trade_Type'], sort=False)
+            ],
+        })
+    return responses
+
+def get_responses():
+    # get_data_version hanya membaca stat file; body dibangun ulang hanya saat data berubah.
+    data_version = data_loader.get_data_version()
+    if response_store["data_version"] != data_version:
+        with response_store_lock:
+            if response_store["data_version"] != data_version:
+                responses = build_responses()
+                response_store["responses"] = responses
+                if responses:
+                    response_store["data_version"] = data_version
+                else:
+                    # Versi ini tidak ditandai selesai, sehingga request berikutnya membangun ulang alih-alih 404 terus.
+                    data_loader.discard_trade_store(config.DEFAULT_REPORTER_PAIR, data_version)
+    return response_store["responses"]
+
+def send_precomputed(key):
+    cached = get_responses().get(key)
+    if cached is None:
+        raise NotFound(f"No data for {'/'.join(str(part) for part in key)}.")
+    body, etag = cached
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    # Klien boleh menyimpan respons tetapi harus memvalidasi ulang (If-None-Match) setiap kali.
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.errorhandler(HTTPException)
+def handle_http_error(error):
+    return Response(
+        json.dumps({"error": error.name, "message": error.description}), status=error.code, mimetype="application/json"
+    )
+
+@app.get("/api/meta")
+def get_meta():
+    return send_precomputed(("meta",))
+
+@app.get("/api/dominance/<int:year>/<flow>")
+def get_dominance(year, flow):
+    return send_precomputed(("dominance", year, flow))
+
+@app.get("/api/top-partners/<int:year>/<flow>")
+def get_top_partners(year, flow):
+    continent = request.args.get("continent", config.DEFAULT_TABLE_CONTINENT)
+    order = request.args.get("order", "desc")
+    if order not in ORDER_OPTIONS:
+        raise BadRequest(f"order must be one of {', '.join(ORDER_OPTIONS)}.")
+    return send_precomputed(("top_partners", year, flow, config.CONTINENT_OPTIONS.get(continent, continent), order))
+
+@app.get("/api/trend")
+def get_trend():
+    return send_precomputed(("trend",))
+
+if __name__ == "__main__":
+    # Body dibangun sebelum server menerima request pertama.
+    get_responses()
+    app.run(host=config.API_HOST, port=config.API_PORT)
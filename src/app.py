@@ -1,12 +1,200 @@
 import streamlit as st
 import pandas as pd
-from components import layout, map_plotter, line_chart_plotter, table_plotter
+from components import layout, map_plotter, line_chart_plotter, table_plotter, rerun_timing, prebuilt_views, figure_cache
 import config
 import styles
 import data_loader
 
+# Setiap bagian (peta, tren, tabel) adalah fragment: widget di dalamnya hanya menjalankan ulang bagian itu
+# sendiri, bukan seluruh halaman. State tiap bagian tetap di st.session_state dengan key masing-masing.
+@st.fragment
+def map_section(df_dominance_all, available_years_all, data_version, reporter_pair, manifest):
+    with rerun_timing.fragment_run("map_section"):
+        col_empty, col_map_filter_container, _ = st.columns([0.05, 0.15, 0.80])
+        with col_map_filter_container:
+            map_trade_flow_display_options = list(config.TRADE_FLOW_MAP.keys())
+            selected_trade_flow_display_map_val = st.selectbox(
+                "Trade Type:",
+                options=map_trade_flow_display_options,
+                index=map_trade_flow_display_options.index(st.session_state.active_trade_flow_display_map),
+                key="map_trade_flow_filter"
+            )
+            st.session_state.active_trade_flow_display_map = selected_trade_flow_display_map_val
+
+        current_selected_flow_key_map = config.TRADE_FLOW_MAP.get(
+            st.session_state.active_trade_flow_display_map,
+            config.TRADE_FLOW_MAP[config.DEFAULT_TRADE_FLOW_DISPLAY]
+        )
+
+        current_map_year = st.session_state.active_year_map
+        if available_years_all and current_map_year not in available_years_all:
+            current_map_year = max(available_years_all)
+            st.session_state.active_year_map = current_map_year
+
+        with rerun_timing.section("map_build"):
+            fig_map = prebuilt_views.get_prebuilt_figure(
+                manifest, prebuilt_views.map_view_key(current_selected_flow_key_map, current_map_year)
+            )
+            if fig_map is None:
+                geojson_data = data_loader.get_geojson_for_view("World")
+                if not df_dominance_all.empty and geojson_data and available_years_all:
+                    fig_map = map_plotter.get_choropleth_map(
+                        data_version, df_dominance_all, available_years_all, geojson_data,
+                        min(available_years_all), max(available_years_all),
+                        current_selected_year=current_map_year,
+                        selected_flow_key=current_selected_flow_key_map,
+                        selected_continent="World",
+                        reporter_pair=reporter_pair
+                    )
+        if fig_map is not None:
+            rerun_timing.record_payload("map_figure", fig_map)
+            with rerun_timing.section("map_render"):
+                figure_cache.plotly_chart_spec(fig_map, config.PLOTLY_CONFIG_ENHANCED)
+        else:
+            st.warning("Data for the map is incomplete, the map cannot be displayed.")
+
+@st.fragment
+def trend_section(data_version, reporter_pair, manifest):
+    with rerun_timing.fragment_run("trend_section"):
+        # Pilihan view (ekspor, impor, keduanya, neraca) ada di tombol dalam figure dan berjalan di browser.
+        with rerun_timing.section("line_chart_build"):
+            fig_line_chart = prebuilt_views.get_prebuilt_figure(
+                manifest, prebuilt_views.line_chart_view_key(config.DEFAULT_LINE_CHART_VIEW)
+            )
+        if fig_line_chart is None:
+            with rerun_timing.section("line_chart_data"):
+                df_line_chart_data = line_chart_plotter.load_line_chart_data(reporter_pair, data_version)
+            if not df_line_chart_data.empty:
+                with rerun_timing.section("line_chart_build"):
+                    fig_line_chart = line_chart_plotter.get_trade_trend_line_chart(
+                        data_version, df_line_chart_data,
+                        selected_view=config.DEFAULT_LINE_CHART_VIEW,
+                        reporter_pair=reporter_pair
+                    )
+        if fig_line_chart is not None:
+            rerun_timing.record_payload("line_chart_figure", fig_line_chart)
+            with rerun_timing.section("line_chart_render"):
+                figure_cache.plotly_chart_spec(fig_line_chart, config.PLOTLY_CONFIG)
+        else:
+            st.warning("Data for the trade trend line chart cannot be loaded.")
+
+@st.fragment
+def table_section(df_table_prepared, table_index, available_years_all, reporter_pair, manifest):
+    with rerun_timing.fragment_run("table_section"):
+        if df_table_prepared.empty:
+            st.warning("Data for table analysis is not available.")
+        else:
+            col_filter1, col_filter2, col_filter3, col_filter4 = st.columns(4)
+            with col_filter1:
+                current_table_year_default = st.session_state.selected_year_table
+                if current_table_year_default not in available_years_all:
+                    current_table_year_default = config.DEFAULT_TABLE_YEAR if config.DEFAULT_TABLE_YEAR in available_years_all else available_years_all[0]
+                selected_year_table_val = st.selectbox("Year:", options=available_years_all, index=available_years_all.index(current_table_year_default), key="table_year_filter")
+                st.session_state.selected_year_table = selected_year_table_val
+            with col_filter2:
+                continent_display_names = list(config.CONTINENT_OPTIONS.keys())
+                selected_continent_display_table = st.selectbox("Continent:", options=continent_display_names, index=continent_display_names.index(st.session_state.selected_continent_table), key="table_continent_filter")
+                st.session_state.selected_continent_table = selected_continent_display_table
+            with col_filter3:
+                trade_flow_display_options_table = list(config.TRADE_FLOW_MAP.keys())
+                selected_trade_flow_display_table = st.selectbox("Trade Type:", options=trade_flow_display_options_table, index=trade_flow_display_options_table.index(st.session_state.selected_trade_flow_table), key="table_trade_flow_filter")
+                st.session_state.selected_trade_flow_table = selected_trade_flow_display_table
+            with col_filter4:
+                selected_sort_order_table = st.selectbox("Sort (Total Trade):", options=config.SORT_ORDER_OPTIONS, index=config.SORT_ORDER_OPTIONS.index(st.session_state.sort_order_table), key="table_sort_order_filter")
+                st.session_state.sort_order_table = selected_sort_order_table
+
+            st.markdown("<div style='margin-bottom: 1.0rem;'></div>", unsafe_allow_html=True)
+
+            current_year = st.session_state.selected_year_table
+            current_continent_display = st.session_state.selected_continent_table
+            current_trade_flow_display = st.session_state.selected_trade_flow_table
+            current_sort_order = st.session_state.sort_order_table
+
+            current_flow_key = config.TRADE_FLOW_MAP[current_trade_flow_display]
+            current_continent_code = config.CONTINENT_OPTIONS[current_continent_display]
+            with rerun_timing.section("table_filter"):
+                prebuilt_table = None
+                if config.TABLE_RENDER_MODE == "html":
+                    prebuilt_table = prebuilt_views.get_prebuilt_table(
+                        manifest, prebuilt_views.table_view_key(current_year, current_continent_code, current_flow_key, current_sort_order)
+                    )
+                if prebuilt_table is not None:
+                    df_top_n_raw = None
+                    table_html = prebuilt_table["html"]
+                    table_row_count = prebuilt_table["row_count"]
+                else:
+                    df_top_n_raw = data_loader.get_top_partners(
+                        df_table_prepared, table_index,
+                        year=current_year,
+                        flow_key=current_flow_key,
+                        continent_code=current_continent_code,
+                        ascending=(current_sort_order == "Ascending"),
+                        top_n=config.TOP_N_COUNTRIES
+                    )
+                    table_html = None
+                    table_row_count = len(df_top_n_raw)
+
+            if table_row_count == 0:
+                st.info(f"There's no {current_trade_flow_display} to display in {current_year} (Continent: {current_continent_display}).")
+            else:
+                continent_title_part_display = f"Continent: {current_continent_display}" if current_continent_display != "World" else "Worldwide"
+                st.markdown(f"""
+                <div style="text-align: center; margin-bottom: 5px;">
+                    <h4 style="color: {config.TEXT_COLOR_PRIMARY}; margin-bottom: 0px;">Top {min(config.TOP_N_COUNTRIES, table_row_count)} Trading Partners</h4>
+                    <p style="color: {config.TEXT_COLOR_SECONDARY}; font-size: 12px; margin-top:0; margin-bottom: 15px;">
+                        Type: {current_trade_flow_display} | Year: {current_year} | {continent_title_part_display}
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+
+                if config.TABLE_RENDER_MODE == "html":
+                    # Seluruh tabel (termasuk grafik proporsi) dikirim sebagai satu elemen.
+                    if table_html is None:
+                        with rerun_timing.section("table_pies"):
+                            table_html = table_plotter.generate_trade_table_html(df_top_n_raw, reporter_pair)
+                    rerun_timing.record_payload("table_html", table_html)
+                    with rerun_timing.section("table_render"):
+                        st.markdown(table_html, unsafe_allow_html=True)
+                else:
+                    with rerun_timing.section("table_pies"):
+                        df_display_table, pie_glyphs = table_plotter.generate_trade_table_data_and_pies(df_top_n_raw, reporter_pair)
+
+                    with rerun_timing.section("table_render"):
+                        header_cols = st.columns([0.5, 2, 1.5, 1.5, 1.5, 1])
+                        headers = table_plotter.get_table_headers(reporter_pair)
+                        for col, header in zip(header_cols, headers):
+                            col.markdown(f"<p style='color: {config.TEXT_COLOR_PRIMARY}; font-weight: bold; font-size: 0.9em;'>{header}</p>", unsafe_allow_html=True)
+
+                        st.markdown("<hr style='margin-top: 0.1rem; margin-bottom: 0.5rem; border-color: #4A5568;'>", unsafe_allow_html=True)
+
+                        for i in range(len(df_display_table)):
+                            row_data = df_display_table.iloc[i]
+
+                            row_cols = st.columns([0.5, 2, 1.5, 1.5, 1.5, 1])
+
+                            with row_cols[0]:
+                                st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data['Rank']}</span>", unsafe_allow_html=True)
+                            with row_cols[1]:
+                                st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data['Country']}</span>", unsafe_allow_html=True)
+                            with row_cols[2]:
+                                st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data[headers[2]]}</span>", unsafe_allow_html=True)
+                            with row_cols[3]:
+                                st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data[headers[3]]}</span>", unsafe_allow_html=True)
+                            with row_cols[4]:
+                                st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data[headers[4]]}</span>", unsafe_allow_html=True)
+                            with row_cols[5]:
+                                st.markdown(pie_glyphs[i], unsafe_allow_html=True)
+
+                            if i < len(df_display_table) - 1:
+                                st.markdown("<hr style='margin-top: 0.2rem; margin-bottom: 0.2rem; border-style: dashed; border-color: #4A5568;'>", unsafe_allow_html=True)
+
+
 def main():
     st.set_page_config(layout=config.LAYOUT, page_title=config.PAGE_TITLE)
+    with rerun_timing.timed_run("main"):
+        render_dashboard()
+
+def render_dashboard():
     styles.load_global_css()
 
     layout.display_title()
@@ -14,13 +202,20 @@ def main():
     if 'active_trade_flow_display_map' not in st.session_state:
         st.session_state.active_trade_flow_display_map = config.DEFAULT_TRADE_FLOW_DISPLAY
 
-    initial_years_for_map_default = config.YEARS_RANGE
-    temp_df_dom, temp_avail_years = data_loader.load_trade_data()
-    if temp_avail_years:
-        initial_years_for_map_default = temp_avail_years
+    reporter_pair = config.DEFAULT_REPORTER_PAIR
+    label_a, _ = data_loader.reporter_display(reporter_pair[0], 0)
+    label_b, _ = data_loader.reporter_display(reporter_pair[1], 1)
+
+    # Store read-only dibagi semua sesi; cukup satu lookup per rerun, tanpa menyalin frame.
+    with rerun_timing.section("data_load"):
+        data_version = data_loader.get_data_version()
+        trade_store = data_loader.load_trade_store(reporter_pair, data_version)
+        manifest = prebuilt_views.get_manifest(data_version, reporter_pair)
+    df_dominance_all, available_years_all = trade_store.df_dominance, trade_store.available_years
+    df_table_prepared, table_index = trade_store.df_table, trade_store.table_index
 
     if 'active_year_map' not in st.session_state:
-        st.session_state.active_year_map = max(initial_years_for_map_default) if initial_years_for_map_default else config.YEARS_RANGE[-1]
+        st.session_state.active_year_map = max(available_years_all) if available_years_all else config.YEARS_RANGE[-1]
 
     if 'selected_year_table' not in st.session_state:
         st.session_state.selected_year_table = config.DEFAULT_TABLE_YEAR
@@ -30,14 +225,10 @@ def main():
         st.session_state.selected_trade_flow_table = config.DEFAULT_TRADE_FLOW_DISPLAY
     if 'sort_order_table' not in st.session_state:
         st.session_state.sort_order_table = config.DEFAULT_TABLE_SORT_ORDER
-    if 'selected_view_line_chart' not in st.session_state:
-        st.session_state.selected_view_line_chart = "Exports"
 
-    df_dominance_all, available_years_all = data_loader.load_trade_data()
     if df_dominance_all.empty or not available_years_all:
         st.error("Failed to load main trade data. The application cannot proceed.")
         st.stop()
-    df_table_prepared = data_loader.prepare_table_data(df_dominance_all)
     if df_table_prepared.empty and not df_dominance_all.empty:
         st.error("Failed to prepare data for the table.")
 
@@ -46,84 +237,33 @@ def main():
         unsafe_allow_html=True
     )
     st.markdown(
-        """
+        f"""
         <p style='color: #A0AEC0; font-size: 14px; margin-bottom: 10px; text-align: center;'>
-            This choropleth map shows which countries are dominated by the US or China in terms of trade volume 
+            This choropleth map shows which countries are dominated by {label_a} or {label_b} in terms of trade volume 
             (Exports or Imports) for the selected year. Use the slider to explore changes over time.
         </p>
         """,
         unsafe_allow_html=True
     )
 
-    col_empty, col_map_filter_container, _ = st.columns([0.05, 0.15, 0.80])
-    with col_map_filter_container:
-        map_trade_flow_display_options = list(config.TRADE_FLOW_MAP.keys())
-        selected_trade_flow_display_map_val = st.selectbox(
-            "Trade Type:",
-            options=map_trade_flow_display_options,
-            index=map_trade_flow_display_options.index(st.session_state.active_trade_flow_display_map),
-            key="map_trade_flow_filter"
-        )
-        st.session_state.active_trade_flow_display_map = selected_trade_flow_display_map_val
-
-    current_selected_flow_key_map = config.TRADE_FLOW_MAP.get(
-        st.session_state.active_trade_flow_display_map,
-        config.TRADE_FLOW_MAP[config.DEFAULT_TRADE_FLOW_DISPLAY]
-    )
-
-    geojson_data = data_loader.get_geojson_data()
-    if not df_dominance_all.empty and geojson_data and available_years_all:
-        current_map_year = st.session_state.active_year_map
-        if current_map_year not in available_years_all:
-            current_map_year = max(available_years_all) if available_years_all else config.YEARS_RANGE[-1]
-            st.session_state.active_year_map = current_map_year
-
-        fig_map = map_plotter.create_choropleth_map(
-            df_dominance_all, available_years_all, geojson_data,
-            min(available_years_all), max(available_years_all),
-            current_selected_year=current_map_year,
-            selected_flow_key=current_selected_flow_key_map,
-            selected_continent="World"
-        )
-        st.plotly_chart(fig_map, use_container_width=True, config=config.PLOTLY_CONFIG_ENHANCED)
-    else:
-        st.warning("Data for the map is incomplete, the map cannot be displayed.")
+    map_section(df_dominance_all, available_years_all, data_version, reporter_pair, manifest)
 
     st.markdown("<br><hr style='margin-top: 0.5rem; margin-bottom: 0.5rem;'><br>", unsafe_allow_html=True)
 
     st.markdown(
-        "<h3 style='text-align: center; color: #E2E8F0; padding-top: 10px;'>📈 US vs China: Export & Import Trends</h3>",
+        f"<h3 style='text-align: center; color: #E2E8F0; padding-top: 10px;'>📈 {label_a} vs {label_b}: Export & Import Trends</h3>",
         unsafe_allow_html=True
     )
     st.markdown(
-        """
+        f"""
         <p style='color: #A0AEC0; font-size: 14px; margin-bottom: 10px; text-align: center;'>
-            Compare the export and import trends of the US and China over time. 
-            Select 'Exports' or 'Imports' to see how their trade values have evolved.
+            Compare the export and import trends of {label_a} and {label_b} over time. 
+            Use the buttons above the chart to show exports, imports, both together, or each side's trade balance.
         </p>
         """,
         unsafe_allow_html=True
     )
-    col_empty, col_lc_filter_container, _ = st.columns([0.05, 0.1, 0.85])
-    with col_lc_filter_container:
-        line_chart_view_options = ["Exports", "Imports"]
-        selected_view_lc_val = st.selectbox(
-            "Trade Type:",
-            options=line_chart_view_options,
-            index=line_chart_view_options.index(st.session_state.selected_view_line_chart),
-            key="line_chart_view_filter"
-        )
-        st.session_state.selected_view_line_chart = selected_view_lc_val
-
-    df_line_chart_data = line_chart_plotter.load_line_chart_data()
-    if not df_line_chart_data.empty:
-        fig_line_chart = line_chart_plotter.create_trade_trend_line_chart(
-            df_line_chart_data,
-            selected_view=st.session_state.selected_view_line_chart
-        )
-        st.plotly_chart(fig_line_chart, use_container_width=True, config=config.PLOTLY_CONFIG)
-    else:
-        st.warning("Data for the trade trend line chart cannot be loaded.")
+    trend_section(data_version, reporter_pair, manifest)
 
     st.markdown("<br><hr style='margin-top: 0.5rem; margin-bottom: 0.5rem;'><br>", unsafe_allow_html=True)
 
@@ -133,121 +273,22 @@ def main():
     )
 
     st.markdown(
-        """
+        f"""
         <p style='color: #A0AEC0; font-size: 14px; margin-bottom: 10px; text-align: center; padding-bottom: 50px;'>
             This table highlights the top trading partners for the selected trade type, year, and continent, 
-            showing the trade volumes with the US and China, along with their combined impact.
+            showing the trade volumes with {label_a} and {label_b}, along with their combined impact.
         </p>
         """,
         unsafe_allow_html=True
     )
 
-    if df_table_prepared.empty:
-        st.warning("Data for table analysis is not available.")
-    else:
-        col_filter1, col_filter2, col_filter3, col_filter4 = st.columns(4)
-        with col_filter1:
-            current_table_year_default = st.session_state.selected_year_table
-            if current_table_year_default not in available_years_all:
-                current_table_year_default = config.DEFAULT_TABLE_YEAR if config.DEFAULT_TABLE_YEAR in available_years_all else available_years_all[0]
-            selected_year_table_val = st.selectbox("Year:", options=available_years_all, index=available_years_all.index(current_table_year_default), key="table_year_filter")
-            st.session_state.selected_year_table = selected_year_table_val
-        with col_filter2:
-            continent_display_names = list(config.CONTINENT_OPTIONS.keys())
-            selected_continent_display_table = st.selectbox("Continent:", options=continent_display_names, index=continent_display_names.index(st.session_state.selected_continent_table), key="table_continent_filter")
-            st.session_state.selected_continent_table = selected_continent_display_table
-        with col_filter3:
-            trade_flow_display_options_table = list(config.TRADE_FLOW_MAP.keys())
-            selected_trade_flow_display_table = st.selectbox("Trade Type:", options=trade_flow_display_options_table, index=trade_flow_display_options_table.index(st.session_state.selected_trade_flow_table), key="table_trade_flow_filter")
-            st.session_state.selected_trade_flow_table = selected_trade_flow_display_table
-        with col_filter4:
-            selected_sort_order_table = st.selectbox("Sort (Total Trade):", options=config.SORT_ORDER_OPTIONS, index=config.SORT_ORDER_OPTIONS.index(st.session_state.sort_order_table), key="table_sort_order_filter")
-            st.session_state.sort_order_table = selected_sort_order_table
-
-        st.markdown("<div style='margin-bottom: 1.0rem;'></div>", unsafe_allow_html=True)
-
-        current_year = st.session_state.selected_year_table
-        current_continent_display = st.session_state.selected_continent_table
-        current_trade_flow_display = st.session_state.selected_trade_flow_table
-        current_sort_order = st.session_state.sort_order_table
-
-        df_year_filtered = df_table_prepared[df_table_prepared['Year'] == current_year]
-        current_trade_flow_key_table = config.TRADE_FLOW_MAP[current_trade_flow_display]
-        df_flow_filtered = df_year_filtered[df_year_filtered['Trade_Flow_Type'] == current_trade_flow_key_table]
-
-        if current_continent_display != "World":
-            current_continent_code = config.CONTINENT_OPTIONS[current_continent_display]
-            if 'Continent_Code' in df_flow_filtered.columns:
-                 df_continent_filtered = df_flow_filtered[df_flow_filtered['Continent_Code'] == current_continent_code]
-            else:
-                st.warning("Column 'Continent_Code' not found for continent filtering.")
-                df_continent_filtered = df_flow_filtered
-        else:
-            df_continent_filtered = df_flow_filtered
-            if 'Continent_Code' in df_continent_filtered.columns:
-                df_continent_filtered = df_continent_filtered[~df_continent_filtered['Continent_Code'].isin(["Unknown", "Group", ""])]
-
-        if 'Total_US_China_Trade' in df_continent_filtered.columns:
-            df_filtered_non_zero = df_continent_filtered[df_continent_filtered['Total_US_China_Trade'] > 0]
-            df_to_sort = df_filtered_non_zero if not df_filtered_non_zero.empty else df_continent_filtered
-            ascending_order = (current_sort_order == "Ascending")
-            df_sorted = df_to_sort.sort_values(by='Total_US_China_Trade', ascending=ascending_order)
-        else:
-            st.warning("'Total_US_China_Trade' column is not found for table sorting.")
-            df_sorted = df_continent_filtered
-
-        df_top_n_raw = df_sorted.head(config.TOP_N_COUNTRIES)
-
-        if df_top_n_raw.empty:
-            st.info(f"There's no {current_trade_flow_display} to display in {current_year} (Continent: {current_continent_display}).")
-        else:
-            df_display_table, pie_figures = table_plotter.generate_trade_table_data_and_pies(df_top_n_raw)
-
-            continent_title_part_display = f"Continent: {current_continent_display}" if current_continent_display != "World" else "Worldwide"
-            st.markdown(f"""
-            <div style="text-align: center; margin-bottom: 5px;">
-                <h4 style="color: {config.TEXT_COLOR_PRIMARY}; margin-bottom: 0px;">Top {min(config.TOP_N_COUNTRIES, len(df_display_table))} Trading Partners</h4>
-                <p style="color: {config.TEXT_COLOR_SECONDARY}; font-size: 12px; margin-top:0; margin-bottom: 15px;">
-                    Type: {current_trade_flow_display} | Year: {current_year} | {continent_title_part_display}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-
-            header_cols = st.columns([0.5, 2, 1.5, 1.5, 1.5, 1])
-            headers = ["Rank", "Country", "US Trade", "China Trade", "Total (US+China)", "Proportion"]
-            for col, header in zip(header_cols, headers):
-                col.markdown(f"<p style='color: {config.TEXT_COLOR_PRIMARY}; font-weight: bold; font-size: 0.9em;'>{header}</p>", unsafe_allow_html=True)
-
-            st.markdown("<hr style='margin-top: 0.1rem; margin-bottom: 0.5rem; border-color: #4A5568;'>", unsafe_allow_html=True)
-
-            for i in range(len(df_display_table)):
-                row_data = df_display_table.iloc[i]
-                pie_fig_to_display = pie_figures[i]
-
-                row_cols = st.columns([0.5, 2, 1.5, 1.5, 1.5, 1])
-
-                with row_cols[0]:
-                    st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data['Rank']}</span>", unsafe_allow_html=True)
-                with row_cols[1]:
-                    st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data['Country']}</span>", unsafe_allow_html=True)
-                with row_cols[2]:
-                    st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data['US Trade']}</span>", unsafe_allow_html=True)
-                with row_cols[3]:
-                    st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data['China Trade']}</span>", unsafe_allow_html=True)
-                with row_cols[4]:
-                    st.markdown(f"<span style='color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em;'>{row_data['Total (US+China)']}</span>", unsafe_allow_html=True)
-                with row_cols[5]:
-                    if pie_fig_to_display:
-                        st.plotly_chart(pie_fig_to_display, use_container_width=True, config={'displayModeBar': False})
-                    else:
-                        st.markdown(f"<div style='width:60px; height:60px; border-radius:50%; background-color:{config.HEX_COLOR_NO_DATA}; display:flex; align-items:center; justify-content:center; font-size:10px; color:white; margin:auto;'>N/A</div>", unsafe_allow_html=True)
-
-                if i < len(df_display_table) - 1:
-                    st.markdown("<hr style='margin-top: 0.2rem; margin-bottom: 0.2rem; border-style: dashed; border-color: #4A5568;'>", unsafe_allow_html=True)
+    table_section(df_table_prepared, table_index, available_years_all, reporter_pair, manifest)
 
     st.markdown("<br><hr style='margin-top: 0.5rem; margin-bottom: 0.5rem;'><br>", unsafe_allow_html=True)
 
     layout.display_key_findings()
-    layout.display_authors()
+    with rerun_timing.section("authors"):
+        layout.display_authors()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import json
+import threading
+from cachetools import LRUCache
+from streamlit.delta_generator_singletons import get_dg_singleton_instance
+from streamlit.elements.lib.form_utils import current_form_id
+from streamlit.elements.lib.utils import compute_and_register_element_id
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+import config
+
+# Spec JSON figure Plotly yang sudah jadi, dibagi antar sesi. Yang disimpan adalah hasil serialisasi, bukan
+# objek go.Figure: st.plotly_chart memvalidasi, menyalin (to_dict), dan men-serialisasi figure pada setiap
+# pemanggilan, padahal spec-nya sama selama kuncinya (parameter builder + versi data) sama.
+FIGURE_CACHE = LRUCache(maxsize=config.FIGURE_CACHE_MAX_ENTRIES)
+FIGURE_CACHE_LOCK = threading.Lock()
+
+# Nilai bawaan st.plotly_chart, dipakai agar id elemen sama seperti chart yang dikirim lewat st.plotly_chart.
+PLOTLY_CHART_THEME = "streamlit"
+PLOTLY_SELECTION_MODE = ("points", "box", "lasso")
+
+def get_or_build_figure_spec(builder_name, cache_key, build_figure):
+    full_key = (builder_name, cache_key)
+    with FIGURE_CACHE_LOCK:
+        spec = FIGURE_CACHE.get(full_key)
+    if spec is None:
+        spec = build_figure().to_json()
+        with FIGURE_CACHE_LOCK:
+            FIGURE_CACHE[full_key] = spec
+    return spec
+
+def plotly_chart_spec(spec, plotly_config=None, use_container_width=True):
+    # Setara st.plotly_chart(fig, use_container_width=..., config=...) tanpa selection, tetapi spec JSON yang
+    # sudah jadi langsung dikirim ke frontend tanpa to_dict, validasi, dan to_json ulang setiap rerun.
+    dg = get_dg_singleton_instance().main_dg
+    chart_config = dict(plotly_config or {})
+    chart_config.setdefault("showLink", False)
+    chart_config.setdefault("linkText", False)
+
+    proto = PlotlyChartProto()
+    proto.use_container_width = use_container_width
+    proto.theme = PLOTLY_CHART_THEME
+    proto.form_id = current_form_id(dg)
+    proto.spec = spec
+    proto.config = json.dumps(chart_config)
+    proto.id = compute_and_register_element_id(
+        "plotly_chart",
+        user_key=None,
+        form_id=proto.form_id,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        selection_mode=PLOTLY_SELECTION_MODE,
+        is_selection_activated=False,
+        theme=PLOTLY_CHART_THEME,
+        use_container_width=use_container_width,
+    )
+    return dg._enqueue("plotly_chart", proto)
+
+def clear_figure_cache():
+    with FIGURE_CACHE_LOCK:
+        FIGURE_CACHE.clear()
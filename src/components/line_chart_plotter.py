@@ -2,95 +2,107 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import config
-from data_loader import format_trade_value
+from data_loader import (
+    format_trade_values, get_trade_cube, compute_trend_frame, reporter_display, missing_reporters, missing_reporters_message
+)
+from components.figure_cache import get_or_build_figure_spec
 
 @st.cache_data
-def load_line_chart_data():
-    try:
-        df = pd.read_csv(config.TRADE_DATA_PATH)
-    except FileNotFoundError:
-        st.error(f"File '{config.TRADE_DATA_PATH}' not found for line chart.")
+def load_line_chart_data(reporter_pair=config.DEFAULT_REPORTER_PAIR, data_version=None):
+    # data_version hanya kunci cache agar tren ikut dihitung ulang saat data berubah.
+    cube = get_trade_cube()
+    if cube is None:
+        return pd.DataFrame()
+    unknown_reporters = missing_reporters(cube, reporter_pair)
+    if unknown_reporters:
+        st.error(missing_reporters_message(unknown_reporters))
         return pd.DataFrame()
 
-    df_us_china = df[df['Country'].isin(['United States', 'China'])].copy()
-    year_columns = [str(y) for y in config.YEARS_RANGE if str(y) in df_us_china.columns]
-
-    df_melted = df_us_china.melt(
-        id_vars=['Country', 'Trade_Type', 'Partner'],
-        value_vars=year_columns,
-        var_name='Year',
-        value_name='Value'
-    )
+    df_aggregated = compute_trend_frame(cube, reporter_pair)
 
-    df_melted['Year'] = pd.to_numeric(df_melted['Year'])
-    df_melted['Value'] = pd.to_numeric(df_melted['Value'], errors='coerce').fillna(0)
+    df_aggregated['Formatted_Value'] = format_trade_values(df_aggregated['Value'])
 
-    df_aggregated = df_melted.groupby(['Country', 'Trade_Type', 'Year'])['Value'].sum().reset_index()
+    return df_aggregated
 
-    df_aggregated['Formatted_Value'] = df_aggregated['Value'].apply(format_trade_value)
+# Trace yang tampil di setiap view. Perpindahan view ditangani tombol Plotly (updatemenus) di browser,
+# jadi figure memuat semua trace sekaligus dan tidak ada rerun server saat view diganti.
+LINE_CHART_VIEW_TRACES = {
+    "Exports": ("Export",),
+    "Imports": ("Import",),
+    "Exports & Imports": ("Export", "Import"),
+    "Trade Balance": ("Balance",),
+}
+LINE_CHART_SERIES_LABELS = {"Export": "Exports", "Import": "Imports", "Balance": "Trade Balance"}
 
-    return df_aggregated
+def line_chart_view_updates(selected_view, trace_series):
+    # Argumen "update" Plotly untuk satu view: visibilitas dan gaya garis per trace, plus judul sumbu y.
+    shown_series = LINE_CHART_VIEW_TRACES[selected_view]
+    overlay = len(shown_series) > 1
+    is_balance = shown_series == ("Balance",)
+    trace_updates = {
+        "visible": [series in shown_series for series in trace_series],
+        # Saat ekspor dan impor tampil bersama, impor digambar putus-putus agar bisa dibedakan.
+        "line.dash": ["dot" if overlay and series == "Import" else "solid" for series in trace_series],
+    }
+    layout_updates = {
+        "yaxis.title.text": "Trade Balance (USD)" if is_balance else "Trade Value (USD)",
+        "yaxis.zeroline": is_balance,
+    }
+    return trace_updates, layout_updates
 
-def create_trade_trend_line_chart(df_trend_data, selected_view="Exports"):
+def create_trade_trend_line_chart(df_trend_data, selected_view=config.DEFAULT_LINE_CHART_VIEW, reporter_pair=config.DEFAULT_REPORTER_PAIR):
     if df_trend_data.empty:
         return go.Figure()
 
     fig = go.Figure()
 
-    countries = ['United States', 'China']
-    country_colors = {
-        'United States': config.COLOR_US_REF,
-        'China': config.COLOR_CHINA_REF
-    }
-
-    show_exports = (selected_view == "Exports")
-    show_imports = (selected_view == "Imports")
+    countries = list(reporter_pair)
+    country_colors = {country: reporter_display(country, side)[1] for side, country in enumerate(countries)}
 
+    series_frames = {}
     for country in countries:
-        df_country_export = df_trend_data[
-            (df_trend_data['Country'] == country) &
-            (df_trend_data['Trade_Type'] == 'Export')
-        ]
-        fig.add_trace(go.Scatter(
-            x=df_country_export['Year'],
-            y=df_country_export['Value'],
-            name=f'{country} Exports',
-            mode='lines+markers',
-            line=dict(color=country_colors[country], width=2.5),
-            marker=dict(size=6),
-            customdata=df_country_export['Formatted_Value'],
-            hovertemplate=(
-                f"<b>{country} Exports</b><br>"
-                "Year: %{x}<br>"
-                "Value: %{customdata}<extra></extra>"
-            ),
-            visible=show_exports
-        ))
+        df_country = df_trend_data[df_trend_data['Country'] == country]
+        df_country_export = df_country[df_country['Trade_Type'] == 'Export']
+        df_country_import = df_country[df_country['Trade_Type'] == 'Import']
+        balance_values = df_country_export['Value'].to_numpy() - df_country_import['Value'].to_numpy()
+        series_frames[(country, 'Export')] = df_country_export
+        series_frames[(country, 'Import')] = df_country_import
+        series_frames[(country, 'Balance')] = pd.DataFrame({
+            'Year': df_country_export['Year'].to_numpy(),
+            'Value': balance_values,
+            'Formatted_Value': format_trade_values(balance_values),
+        })
 
-    for country in countries:
-        df_country_import = df_trend_data[
-            (df_trend_data['Country'] == country) &
-            (df_trend_data['Trade_Type'] == 'Import')
-        ]
-        fig.add_trace(go.Scatter(
-            x=df_country_import['Year'],
-            y=df_country_import['Value'],
-            name=f'{country} Imports',
-            mode='lines+markers',
-            line=dict(color=country_colors[country], width=2.5),
-            marker=dict(size=6, symbol='circle'),
-            customdata=df_country_import['Formatted_Value'],
-            hovertemplate=(
-                f"<b>{country} Imports</b><br>"
-                "Year: %{x}<br>"
-                "Value: %{customdata}<extra></extra>"
-            ),
-            visible=show_imports
-        ))
+    trace_series = []
+    for series in ('Export', 'Import', 'Balance'):
+        for country in countries:
+            df_series = series_frames[(country, series)]
+            series_label = LINE_CHART_SERIES_LABELS[series]
+            fig.add_trace(go.Scatter(
+                x=df_series['Year'],
+                y=df_series['Value'],
+                name=f'{country} {series_label}',
+                mode='lines+markers',
+                line=dict(color=country_colors[country], width=2.5),
+                marker=dict(size=6),
+                customdata=df_series['Formatted_Value'],
+                hovertemplate=(
+                    f"<b>{country} {series_label}</b><br>"
+                    "Year: %{x}<br>"
+                    "Value: %{customdata}<extra></extra>"
+                )
+            ))
+            trace_series.append(series)
+
+    view_names = list(config.LINE_CHART_VIEW_OPTIONS)
+    trace_updates, layout_updates = line_chart_view_updates(selected_view, trace_series)
+    for trace, visible, dash in zip(fig.data, trace_updates["visible"], trace_updates["line.dash"]):
+        trace.visible = visible
+        trace.line.dash = dash
 
     fig.update_layout(
         title=dict(
-            text="US vs China Trade Trends",
+            text=" vs ".join(reporter_display(country, side)[0] for side, country in enumerate(countries)) + " Trade Trends",
             x=0.5,
             xanchor='center',
             font=dict(size=20, color=config.TEXT_COLOR_PRIMARY)
@@ -107,12 +119,13 @@ def create_trade_trend_line_chart(df_trend_data, selected_view="Exports"):
         ),
         yaxis=dict(
             title=dict(
-                text="Trade Value (USD)",
+                text=layout_updates["yaxis.title.text"],
                 font=dict(color=config.TEXT_COLOR_PRIMARY, size=14)
             ),
             showgrid=True,
             gridcolor='#4A5568',
-            zeroline=False,
+            zeroline=layout_updates["yaxis.zeroline"],
+            zerolinecolor=config.TEXT_COLOR_SECONDARY,
             tickfont=dict(color=config.TEXT_COLOR_SECONDARY),
             tickformat="$,.0f"
         ),
@@ -126,7 +139,29 @@ def create_trade_trend_line_chart(df_trend_data, selected_view="Exports"):
         paper_bgcolor=config.PAGE_BG_COLOR,
         plot_bgcolor=config.PAGE_BG_COLOR,
         font=dict(color=config.TEXT_COLOR_PRIMARY, family='"Helvetica Neue", Helvetica, Arial, sans-serif'),
+        updatemenus=[dict(
+            type="buttons",
+            direction="right",
+            active=view_names.index(selected_view),
+            buttons=[
+                dict(label=view, method="update", args=list(line_chart_view_updates(view, trace_series)))
+                for view in view_names
+            ],
+            x=0, xanchor="left",
+            y=1.02, yanchor="bottom",
+            pad=dict(r=4, t=4),
+            bgcolor='#2D3748',
+            bordercolor='#4A5568',
+            font=dict(color=config.TEXT_COLOR_PRIMARY, size=12),
+            showactive=True
+        )],
         height=500,
         margin=dict(l=90, r=50, t=100, b=80)
     )
-    return fig
\ No newline at end of file
+    return fig
+
+def get_trade_trend_line_chart(data_version, df_trend_data, selected_view=config.DEFAULT_LINE_CHART_VIEW, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    return get_or_build_figure_spec(
+        "trade_trend_line_chart", (data_version, selected_view, tuple(reporter_pair)),
+        lambda: create_trade_trend_line_chart(df_trend_data, selected_view, reporter_pair)
+    )
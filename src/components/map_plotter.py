@@ -1,13 +1,38 @@
 import plotly.graph_objects as go
-import pandas as pd
 import numpy as np
 import config
-from data_loader import format_trade_value
+from data_loader import compute_map_matrices, prepare_map_matrices, select_geometry_level, reporter_display, format_trade_values
+from components.figure_cache import get_or_build_figure_spec
+
+def build_frame_values(map_matrices, year_pos, flow_pos):
+    # Teks hover dirangkai oleh hovertemplate di browser, bukan per negara di server; hanya nilai perdagangan
+    # yang dikirim sudah diformat (T/B/M, sama persis dengan tabel) karena format d3 tidak bisa memilih satuan
+    # per nilai. Rasio hanya menentukan warna dan persen satu desimal, jadi float32 cukup.
+    ratios = map_matrices['ratio'][year_pos, flow_pos].astype(np.float32)
+    customdata = np.column_stack((
+        format_trade_values(map_matrices['reporter_a_trade'][year_pos, flow_pos]),
+        format_trade_values(map_matrices['reporter_b_trade'][year_pos, flow_pos])
+    ))
+    return ratios, customdata
+
+def build_hover_template(year, flow_display_name, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Satu template per trace/frame; nama negara dari `text`, nilai dari customdata, rasio dari z.
+    label_a, _ = reporter_display(reporter_pair[0], 0)
+    label_b, _ = reporter_display(reporter_pair[1], 1)
+    return (
+        f"<b>%{{text}}</b><br>Year: {year}<br>Type: {flow_display_name}<br>"
+        f"{label_a} Trade: %{{customdata[0]}}<br>"
+        f"{label_b} Trade: %{{customdata[1]}}<br>"
+        f"{label_b} Share: %{{z:.1%}}<extra></extra>"
+    )
 
 def create_choropleth_map(df_dominance_all_flows, available_years, geojson_data,
                           min_year, max_year, current_selected_year,
                           selected_flow_key,
-                          selected_continent="World"):
+                          selected_continent="World",
+                          map_matrices=None,
+                          single_flow_trace=None,
+                          reporter_pair=config.DEFAULT_REPORTER_PAIR):
     """
     Creates an enhanced choropleth map with comprehensive zoom functionality.
     
@@ -27,6 +52,11 @@ def create_choropleth_map(df_dominance_all_flows, available_years, geojson_data,
         current_selected_year: Currently selected year
         selected_flow_key: Selected trade flow type
         selected_continent: Selected continent for view
+        map_matrices: Precomputed output of data_loader.prepare_map_matrices (optional)
+        single_flow_trace: Only build the trace for selected_flow_key so the GeoJSON
+            is embedded once (defaults to config.MAP_SINGLE_FLOW_TRACE)
+        reporter_pair: (reporter A, reporter B) compared on the map; must match the
+            pair df_dominance_all_flows was loaded for
     
     Returns:
         plotly.graph_objects.Figure: Enhanced interactive map with zoom features
@@ -35,56 +65,48 @@ def create_choropleth_map(df_dominance_all_flows, available_years, geojson_data,
     if df_dominance_all_flows.empty or not available_years or geojson_data is None:
         return go.Figure()
 
-    map_countries_in_geojson = [feature['properties']['name'] for feature in geojson_data['features']]
+    if map_matrices is None:
+        map_matrices = compute_map_matrices(df_dominance_all_flows, geojson_data)
+
+    map_country_ids = map_matrices['feature_ids']
     fig = go.Figure()
-    flow_keys_ordered = [config.TRADE_FLOW_MAP[display_name] for display_name in config.TRADE_FLOW_OPTIONS_DISPLAY]
+    flow_keys_ordered = map_matrices['flow_keys']
+    if single_flow_trace is None:
+        single_flow_trace = config.MAP_SINGLE_FLOW_TRACE
+    if single_flow_trace and selected_flow_key in flow_keys_ordered:
+        # Setiap trace membawa GeoJSON sendiri; cukup satu trace karena hanya satu flow yang tampil.
+        trace_flow_keys = [selected_flow_key]
+    else:
+        trace_flow_keys = flow_keys_ordered
+    flow_display_names = {fk: dn for dn, fk in reversed(list(config.TRADE_FLOW_MAP.items()))}
+    year_positions = {int(year): i for i, year in enumerate(map_matrices['years'])}
+    label_a, color_a = reporter_display(reporter_pair[0], 0)
+    label_b, color_b = reporter_display(reporter_pair[1], 1)
 
     initial_year_to_display = current_selected_year
     if initial_year_to_display not in available_years:
         initial_year_to_display = max(available_years) if available_years else min_year
 
-    for i, flow_key_trace in enumerate(flow_keys_ordered):
-        df_flow_specific = df_dominance_all_flows[df_dominance_all_flows['Trade_Flow_Type'] == flow_key_trace]
-        df_initial_year_flow = df_flow_specific[df_flow_specific['Year'] == initial_year_to_display]
-
-        ratio_dict = pd.Series(df_initial_year_flow.Ratio.values, index=df_initial_year_flow.Partner).to_dict()
-        us_trade_dict = pd.Series(df_initial_year_flow.US_Trade.values, index=df_initial_year_flow.Partner).to_dict()
-        china_trade_dict = pd.Series(df_initial_year_flow.China_Trade.values, index=df_initial_year_flow.Partner).to_dict()
-
-        z_values, hover_texts, locations = [], [], []
-        for country_name_geojson in map_countries_in_geojson:
-            locations.append(country_name_geojson)
-            ratio = ratio_dict.get(country_name_geojson, np.nan)
-            us_trade = us_trade_dict.get(country_name_geojson, 0)
-            china_trade = china_trade_dict.get(country_name_geojson, 0)
-            z_values.append(ratio)
-
-            country_display_name = country_name_geojson
-            trade_details_text = ""
-            if pd.isna(ratio): trade_details_text = "Data: Not available"
-            elif country_name_geojson == "United States of America": trade_details_text = f"US Trade: {format_trade_value(us_trade)}<br>China Trade: {format_trade_value(china_trade)}<br>(Dominant: US)"
-            elif country_name_geojson == "China": trade_details_text = f"US Trade: {format_trade_value(us_trade)}<br>China Trade: {format_trade_value(china_trade)}<br>(Dominant: China)"
-            else: trade_details_text = (f"US Trade: {format_trade_value(us_trade)}<br>"
-                                      f"China Trade: {format_trade_value(china_trade)}")
-
-            flow_display_name_trace = [dn for dn, fk in config.TRADE_FLOW_MAP.items() if fk == flow_key_trace][0]
-            hover_texts.append(f"<b>{country_display_name}</b><br>Year: {initial_year_to_display}<br>Type: {flow_display_name_trace}<br>{trade_details_text}")
-
+    for flow_key_trace in trace_flow_keys:
+        z_values, customdata = build_frame_values(
+            map_matrices, year_positions[initial_year_to_display], flow_keys_ordered.index(flow_key_trace)
+        )
         is_visible = (flow_key_trace == selected_flow_key)
 
         fig.add_trace(
             go.Choropleth(
                 name=flow_key_trace,
                 geojson=geojson_data,
-                locations=locations,
+                locations=map_country_ids,
                 z=z_values,
-                featureidkey="properties.name",
-                colorscale=[[0, config.HEX_COLOR_US_DOMINANT],
+                featureidkey="id",
+                colorscale=[[0, color_a],
                             [0.5, config.HEX_COLOR_EQUAL_TRADE],
-                            [1, config.HEX_COLOR_CHINA_DOMINANT]],
+                            [1, color_b]],
                 zmin=0, zmax=1,
-                hovertext=hover_texts,
-                hovertemplate="%{hovertext}<extra></extra>",
+                text=map_matrices['feature_names'],
+                customdata=customdata,
+                hovertemplate=build_hover_template(initial_year_to_display, flow_display_names[flow_key_trace], reporter_pair),
                 marker_line_color=config.COLOR_BORDER,
                 marker_line_width=0.3,
                 showscale=False,
@@ -95,32 +117,14 @@ def create_choropleth_map(df_dominance_all_flows, available_years, geojson_data,
     frames = []
     for year in available_years:
         frame_data_list = []
-        for flow_key_trace_frame in flow_keys_ordered: # Iterasi untuk setiap tipe flow dalam frame
-            df_flow_specific = df_dominance_all_flows[df_dominance_all_flows['Trade_Flow_Type'] == flow_key_trace_frame]
-            df_year_flow_filtered = df_flow_specific[df_flow_specific['Year'] == year]
-
-            ratio_dict_year = pd.Series(df_year_flow_filtered.Ratio.values, index=df_year_flow_filtered.Partner).to_dict()
-            us_trade_dict_year = pd.Series(df_year_flow_filtered.US_Trade.values, index=df_year_flow_filtered.Partner).to_dict()
-            china_trade_dict_year = pd.Series(df_year_flow_filtered.China_Trade.values, index=df_year_flow_filtered.Partner).to_dict()
-
-            current_z_values, current_hover_texts = [], []
-            for country_name_geojson in map_countries_in_geojson:
-                ratio = ratio_dict_year.get(country_name_geojson, np.nan)
-                us_trade = us_trade_dict_year.get(country_name_geojson, 0)
-                china_trade = china_trade_dict_year.get(country_name_geojson, 0)
-                current_z_values.append(ratio)
-
-                country_display_name = country_name_geojson
-                trade_details_text = ""
-                if pd.isna(ratio): trade_details_text = "Data: Not available"
-                elif country_name_geojson == "United States of America": trade_details_text = f"US Trade: {format_trade_value(us_trade)}<br>China Trade: {format_trade_value(china_trade)}<br>(Dominant: US)"
-                elif country_name_geojson == "China": trade_details_text = f"US Trade: {format_trade_value(us_trade)}<br>China Trade: {format_trade_value(china_trade)}<br>(Dominant: China)"
-                else: trade_details_text = (f"US Trade: {format_trade_value(us_trade)}<br>"
-                                          f"China Trade: {format_trade_value(china_trade)}")
-                flow_display_name_frame = [dn for dn, fk in config.TRADE_FLOW_MAP.items() if fk == flow_key_trace_frame][0]
-                current_hover_texts.append(f"<b>{country_display_name}</b><br>Year: {year}<br>Type: {flow_display_name_frame}<br>{trade_details_text}")
-
-            frame_data_list.append(go.Choropleth(z=current_z_values, hovertext=current_hover_texts))
+        for flow_key_trace_frame in trace_flow_keys: # Iterasi untuk setiap tipe flow dalam frame
+            current_z_values, current_customdata = build_frame_values(
+                map_matrices, year_positions[year], flow_keys_ordered.index(flow_key_trace_frame)
+            )
+            frame_data_list.append(go.Choropleth(
+                z=current_z_values, customdata=current_customdata,
+                hovertemplate=build_hover_template(year, flow_display_names[flow_key_trace_frame], reporter_pair)
+            ))
 
         frames.append(go.Frame(
             name=str(year),
@@ -239,9 +243,9 @@ def create_choropleth_map(df_dominance_all_flows, available_years, geojson_data,
                 align='center',
                 text=(
                     "<span style='font-size:13px; color:#A0A0A0; font-weight:500;'>Who is the larger trading partner?</span>   "
-                    f"<span style='font-size:16px; color:{config.HEX_COLOR_US_DOMINANT};'>■</span> US   "
+                    f"<span style='font-size:16px; color:{color_a};'>■</span> {label_a}   "
                     f"<span style='font-size:16px; color:{config.HEX_COLOR_EQUAL_TRADE};'>■</span> Equal   "
-                    f"<span style='font-size:16px; color:{config.HEX_COLOR_CHINA_DOMINANT};'>■</span> China   "
+                    f"<span style='font-size:16px; color:{color_b};'>■</span> {label_b}   "
                     f"<span style='font-size:16px; color:{config.HEX_COLOR_NO_DATA};'>■</span> No data"
                 ),
             )
@@ -249,4 +253,33 @@ def create_choropleth_map(df_dominance_all_flows, available_years, geojson_data,
     )
 
     
-    return fig
\ No newline at end of file
+    return fig
+
+def get_choropleth_map(data_version, df_dominance_all_flows, available_years, geojson_data,
+                       min_year, max_year, current_selected_year,
+                       selected_flow_key,
+                       selected_continent="World",
+                       map_matrices=None,
+                       reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    """
+    Cached version of create_choropleth_map that returns the figure's JSON spec.
+
+    The spec is rebuilt only when data_version or one of the view parameters
+    changes. geojson_data must come from data_loader.get_geojson_for_view for the
+    same continent, since the geometry is identified by its level rather than hashed.
+    """
+    cache_key = (
+        data_version, tuple(available_years), min_year, max_year, current_selected_year,
+        selected_flow_key, selected_continent, select_geometry_level(selected_continent),
+        tuple(reporter_pair)
+    )
+    return get_or_build_figure_spec(
+        "choropleth_map", cache_key,
+        lambda: create_choropleth_map(
+            df_dominance_all_flows, available_years, geojson_data,
+            min_year, max_year, current_selected_year,
+            selected_flow_key, selected_continent,
+            map_matrices if map_matrices is not None else prepare_map_matrices(df_dominance_all_flows, geojson_data),
+            reporter_pair=reporter_pair
+        )
+    )
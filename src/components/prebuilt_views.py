@@ -0,0 +1,97 @@
+import json
+import os
+import streamlit as st
+import config
+from data_loader import compute_cache_key, country_dimension_version, file_content_hash
+
+# Artefak view yang dirender sebelumnya oleh src/prebuild_views.py: satu file JSON per figure/tabel dengan
+# hash isi di nama file, plus manifest.json yang memetakan kunci view ke nama file. Manifest hanya dipakai
+# jika versi sumbernya (hash isi data, geometri, dimensi negara, dan parameter render) cocok dengan data saat ini.
+PREBUILT_FORMAT_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+def map_view_key(flow_key, year):
+    return f"map|{flow_key}|{year}"
+
+def line_chart_view_key(view):
+    return f"line_chart|{view}"
+
+def table_view_key(year, continent_code, flow_key, sort_order):
+    return f"table|{year}|{continent_code}|{flow_key}|{sort_order}"
+
+def prebuild_source_version(reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Berbasis isi file (bukan mtime) agar artefak tetap valid setelah disalin ke mesin lain.
+    geometry_hash = file_content_hash(config.GEOJSON_PATH) if config.GEOJSON_URL is None else config.GEOJSON_URL
+    # Setting render yang mengubah isi artefak (jumlah trace, teks hover, bentuk tabel, label dan warna reporter)
+    # ikut menjadi bagian versi, sehingga artefak lama tidak dianggap valid setelah config diubah.
+    render_settings = {
+        "map_single_flow_trace": config.MAP_SINGLE_FLOW_TRACE,
+        "table_render_mode": config.TABLE_RENDER_MODE,
+        "default_line_chart_view": config.DEFAULT_LINE_CHART_VIEW,
+        "reporter_display": {reporter: config.REPORTER_DISPLAY.get(reporter) for reporter in reporter_pair},
+        "reporter_side_colors": list(config.REPORTER_SIDE_COLORS),
+    }
+    return compute_cache_key(
+        PREBUILT_FORMAT_VERSION, file_content_hash(config.TRADE_DATA_PATH), geometry_hash,
+        country_dimension_version(), config.GEOMETRY_LEVELS, config.TOP_N_COUNTRIES, list(reporter_pair), render_settings
+    )
+
+def manifest_path():
+    return os.path.join(config.PREBUILT_VIEWS_DIR, MANIFEST_NAME)
+
+def manifest_version():
+    # Stat manifest ikut menjadi kunci cache: prebuild yang dijalankan setelah app melihat data ini tetap terbaca.
+    try:
+        stat = os.stat(manifest_path())
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+def get_manifest(data_version, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    return load_manifest(data_version, manifest_version(), reporter_pair)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_manifest(data_version, manifest_stat=None, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # data_version dan manifest_stat (murah, berbasis stat file) hanya menjadi kunci cache; hash isi dihitung sekali per versi.
+    if not config.USE_PREBUILT_VIEWS:
+        return None
+    try:
+        with open(manifest_path(), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("source_version") != prebuild_source_version(reporter_pair):
+        return None
+    return manifest
+
+def artifact_path(manifest, view_key):
+    artifact_name = manifest["views"].get(view_key) if manifest else None
+    return os.path.join(config.PREBUILT_VIEWS_DIR, artifact_name) if artifact_name else None
+
+@st.cache_resource(show_spinner=False, max_entries=config.FIGURE_CACHE_MAX_ENTRIES)
+def read_figure_artifact(path):
+    # Artefak figure sudah berupa spec JSON dan dikirim apa adanya. Nama file mengandung hash isi,
+    # jadi path saja sudah cukup sebagai kunci cache.
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+@st.cache_resource(show_spinner=False, max_entries=1024)
+def read_table_artifact(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def get_prebuilt_artifact(read_artifact, manifest, view_key):
+    path = artifact_path(manifest, view_key)
+    if path is None:
+        return None
+    try:
+        return read_artifact(path)
+    except (OSError, ValueError):
+        # Artefak sudah dihapus (prune) atau rusak sementara manifest lama masih di cache: render secara live.
+        return None
+
+def get_prebuilt_figure(manifest, view_key):
+    return get_prebuilt_artifact(read_figure_artifact, manifest, view_key)
+
+def get_prebuilt_table(manifest, view_key):
+    return get_prebuilt_artifact(read_table_artifact, manifest, view_key)
@@ -0,0 +1,120 @@
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import pandas as pd
+import streamlit as st
+import config
+
+# Instrumentasi waktu per bagian untuk setiap rerun. Aktif lewat environment variable
+# config.RERUN_TIMING_ENV_VAR atau query parameter config.RERUN_TIMING_QUERY_PARAM:
+# "log" (atau "1") menulis satu baris log JSON per rerun, "panel" juga menampilkan panel debug.
+# Saat tidak aktif, section() hanya memeriksa satu atribut thread-local.
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+TIMING_MODES = {"1": "log", "log": "log", "panel": "panel"}
+active_runs = threading.local()
+
+def get_timing_mode():
+    # Query parameter mengalahkan environment variable, misalnya ?timing=panel untuk satu sesi.
+    mode = os.environ.get(config.RERUN_TIMING_ENV_VAR, "")
+    mode = st.query_params.get(config.RERUN_TIMING_QUERY_PARAM, mode)
+    return TIMING_MODES.get(mode.strip().lower())
+
+def start_run(run_name):
+    mode = get_timing_mode()
+    active_runs.current = None if mode is None else {
+        "run": run_name,
+        "run_id": uuid.uuid4().hex[:12],
+        "mode": mode,
+        "started": time.perf_counter(),
+        "sections": [],
+        "payload_bytes": {},
+    }
+
+def get_current_run():
+    return getattr(active_runs, "current", None)
+
+@contextlib.contextmanager
+def section(name):
+    run = get_current_run()
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run["sections"].append((name, time.perf_counter() - start))
+
+@contextlib.contextmanager
+def timed_run(run_name):
+    # finish_run ada di finally: run yang berakhir lewat st.stop(), rerun yang dipicu widget, atau exception
+    # tetap tercatat dan tidak tertinggal di thread-local untuk run berikutnya di thread script yang sama.
+    start_run(run_name)
+    try:
+        yield
+    finally:
+        finish_run()
+
+@contextlib.contextmanager
+def fragment_run(run_name):
+    # Di dalam rerun penuh, fragment ikut tercatat di run "main"; saat fragment berjalan sendiri
+    # (widget di dalamnya berubah), ia membuka dan menutup run-nya sendiri.
+    if get_current_run() is not None:
+        yield
+        return
+    with timed_run(run_name):
+        yield
+
+def record_payload(name, payload):
+    # Ukuran payload hanya dihitung saat instrumentasi aktif karena serialisasi figure tidak gratis.
+    run = get_current_run()
+    if run is None:
+        return
+    if hasattr(payload, "to_json"):
+        payload = payload.to_json()
+    run["payload_bytes"][name] = len(payload.encode("utf-8") if isinstance(payload, str) else payload)
+
+def finish_run():
+    run = get_current_run()
+    if run is None:
+        return
+    active_runs.current = None
+    total_seconds = time.perf_counter() - run["started"]
+    sections_ms = {}
+    for name, seconds in run["sections"]:
+        sections_ms[name] = sections_ms.get(name, 0) + seconds * 1000
+    record = {
+        "event": "rerun_timing",
+        "run": run["run"],
+        "run_id": run["run_id"],
+        "total_ms": round(total_seconds * 1000, 2),
+        "sections_ms": {name: round(ms, 2) for name, ms in sections_ms.items()},
+        "payload_bytes": run["payload_bytes"],
+    }
+    logger.info(json.dumps(record))
+
+    if run["mode"] == "panel":
+        with st.expander(f"⏱ Rerun timing ({run['run']}): {record['total_ms']:.0f} ms", expanded=False):
+            st.dataframe(
+                pd.DataFrame(
+                    [(name, ms) for name, ms in record["sections_ms"].items()],
+                    columns=["Section", "Time (ms)"]
+                ),
+                hide_index=True, use_container_width=True
+            )
+            if record["payload_bytes"]:
+                st.dataframe(
+                    pd.DataFrame(list(record["payload_bytes"].items()), columns=["Payload", "Bytes"]),
+                    hide_index=True, use_container_width=True
+                )
@@ -1,65 +1,109 @@
-import streamlit as st
+import functools
+import html
+import math
 import pandas as pd
-import plotly.graph_objects as go
 import config
-from data_loader import format_trade_value
+from data_loader import format_trade_values, reporter_display
 
-def generate_trade_table_data_and_pies(df_filtered_table):
+@functools.lru_cache(maxsize=config.PROPORTION_GLYPH_CACHE_SIZE)
+def get_proportion_glyph_svg(partner, year, flow_key, a_trade_val, b_trade_val, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Donut reporter A/B sebagai SVG inline, di-cache per (partner, year, flow, pasangan). Nilai ikut menjadi
+    # bagian kunci agar glyph otomatis dibuat ulang jika datanya berubah.
+    a_trade_val = max(a_trade_val, 0)
+    b_trade_val = max(b_trade_val, 0)
+    total_trade_val = a_trade_val + b_trade_val
+    if total_trade_val <= 0:
+        return (f"<svg width='60' height='60' viewBox='0 0 60 60' style='display:block; margin:auto;'>"
+                f"<circle cx='30' cy='30' r='30' fill='{config.HEX_COLOR_NO_DATA}'/>"
+                "<text x='30' y='34' text-anchor='middle' font-size='10' fill='white'>N/A</text></svg>")
+
+    label_a, color_a = reporter_display(reporter_pair[0], 0)
+    label_b, color_b = reporter_display(reporter_pair[1], 1)
+    a_share = a_trade_val / total_trade_val
+    # Lingkaran r=21 dengan stroke 18 memberi jari-jari luar 30 dan lubang 12 (hole=0.4 seperti pie sebelumnya).
+    # Irisan reporter A dimulai dari jam 12 berlawanan arah jarum jam, mengikuti arah default go.Pie.
+    circumference = 2 * math.pi * 21
+    return (f"<svg width='60' height='60' viewBox='0 0 60 60' style='display:block; margin:auto;'>"
+            f"<title>{html.escape(str(partner))}: {html.escape(label_a)} {a_share:.1%} | {html.escape(label_b)} {1 - a_share:.1%}</title>"
+            f"<circle cx='30' cy='30' r='21' fill='none' stroke='{color_b}' stroke-width='18'/>"
+            f"<circle cx='30' cy='30' r='21' fill='none' stroke='{color_a}' stroke-width='18' "
+            f"stroke-dasharray='{a_share * circumference:.2f} {circumference:.2f}' transform='rotate(-90 30 30) scale(1 -1) translate(0 -60)'/>"
+            "</svg>")
+
+def get_table_headers(reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    label_a, _ = reporter_display(reporter_pair[0], 0)
+    label_b, _ = reporter_display(reporter_pair[1], 1)
+    return ["Rank", "Country", f"{label_a} Trade", f"{label_b} Trade", f"Total ({label_a}+{label_b})", "Proportion"]
+
+def generate_trade_table_data_and_pies(df_filtered_table, reporter_pair=config.DEFAULT_REPORTER_PAIR):
     if df_filtered_table.empty:
         return pd.DataFrame(), []
 
     table_data_records = []
-    pie_chart_figures = []
+    pie_glyphs = []
+    a_trade_header, b_trade_header, total_header = get_table_headers(reporter_pair)[2:5]
+    a_trade_formatted = format_trade_values(df_filtered_table['Reporter_A_Trade'])
+    b_trade_formatted = format_trade_values(df_filtered_table['Reporter_B_Trade'])
+    total_trade_formatted = format_trade_values(df_filtered_table['Total_Pair_Trade'])
 
-    for index, row in df_filtered_table.iterrows():
+    for row_pos, (index, row) in enumerate(df_filtered_table.iterrows()):
         rank = df_filtered_table.index.get_loc(index) + 1
         country = row['Partner']
-        us_trade_val = row['US_Trade']
-        china_trade_val = row['China_Trade']
-        total_trade_val = row['Total_US_China_Trade']
 
         # Data untuk DataFrame tabel
         table_data_records.append({
             "Rank": rank,
             "Country": country,
-            "US Trade": format_trade_value(us_trade_val),
-            "China Trade": format_trade_value(china_trade_val),
-            "Total (US+China)": format_trade_value(total_trade_val)
+            a_trade_header: a_trade_formatted[row_pos],
+            b_trade_header: b_trade_formatted[row_pos],
+            total_header: total_trade_formatted[row_pos]
         })
 
-        labels = []
-        values = []
-        colors = []
-        pie_fig = None
-
-        if us_trade_val > 0:
-            labels.append('US')
-            values.append(us_trade_val)
-            colors.append(config.COLOR_US_REF)
-        if china_trade_val > 0:
-            labels.append('China')
-            values.append(china_trade_val)
-            colors.append(config.COLOR_CHINA_REF)
-        
-        if values:
-            pie_fig = go.Figure(data=[go.Pie(
-                labels=labels, 
-                values=values, 
-                marker_colors=colors,
-                hole=0.4, 
-                hoverinfo='label+percent', 
-                textinfo='none', 
-                sort=False,
-                automargin=True
-            )])
-            pie_fig.update_layout(
-                showlegend=False, 
-                width=60, height=60,
-                margin=dict(l=0, r=0, t=0, b=0),
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-        
-        pie_chart_figures.append(pie_fig)
+        pie_glyphs.append(get_proportion_glyph_svg(
+            country, int(row['Year']), row['Trade_Flow_Type'], float(row['Reporter_A_Trade']), float(row['Reporter_B_Trade']),
+            tuple(reporter_pair)
+        ))
 
     df_display_table = pd.DataFrame(table_data_records)
-    return df_display_table, pie_chart_figures
\ No newline at end of file
+    return df_display_table, pie_glyphs
+
+TABLE_COLUMN_WIDTHS = [0.5, 2, 1.5, 1.5, 1.5, 1]
+
+def generate_trade_table_html(df_filtered_table, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    if df_filtered_table.empty:
+        return ""
+
+    reporter_pair = tuple(reporter_pair)
+    a_trade_formatted = format_trade_values(df_filtered_table['Reporter_A_Trade'])
+    b_trade_formatted = format_trade_values(df_filtered_table['Reporter_B_Trade'])
+    total_trade_formatted = format_trade_values(df_filtered_table['Total_Pair_Trade'])
+    total_width = sum(TABLE_COLUMN_WIDTHS)
+
+    cell_style = f"color: {config.TEXT_COLOR_SECONDARY}; font-size: 0.9em; border: none; padding: 0.4rem 0.5rem; vertical-align: middle;"
+    header_cells = "".join(
+        f"<th style='width: {width / total_width:.1%}; color: {config.TEXT_COLOR_PRIMARY}; font-weight: bold; font-size: 0.9em; "
+        f"text-align: left; border: none; border-bottom: 1px solid #4A5568; padding: 0.4rem 0.5rem;'>{header}</th>"
+        for header, width in zip(get_table_headers(reporter_pair), TABLE_COLUMN_WIDTHS)
+    )
+
+    rows_html = []
+    n_rows = len(df_filtered_table)
+    for i, (country, year, flow_key, a_trade_val, b_trade_val) in enumerate(zip(
+        df_filtered_table['Partner'], df_filtered_table['Year'], df_filtered_table['Trade_Flow_Type'],
+        df_filtered_table['Reporter_A_Trade'], df_filtered_table['Reporter_B_Trade']
+    )):
+        row_border = "border-bottom: 1px dashed #4A5568;" if i < n_rows - 1 else ""
+        cells = [str(i + 1), html.escape(str(country)), a_trade_formatted[i], b_trade_formatted[i], total_trade_formatted[i]]
+        rows_html.append(
+            f"<tr style='background: transparent; {row_border}'>"
+            + "".join(f"<td style='{cell_style}'>{cell}</td>" for cell in cells)
+            + f"<td style='{cell_style}'>{get_proportion_glyph_svg(country, int(year), flow_key, float(a_trade_val), float(b_trade_val), reporter_pair)}</td>"
+            + "</tr>"
+        )
+
+    return (
+        "<table style='width: 100%; border-collapse: collapse; border: none; table-layout: fixed;'>"
+        f"<thead><tr style='background: transparent;'>{header_cells}</tr></thead>"
+        f"<tbody>{''.join(rows_html)}</tbody>"
+        "</table>"
+    )
@@ -16,16 +16,53 @@ HEX_COLOR_NO_DATA = "#000000"
 HEX_COLOR_US_DOMINANT = COLOR_US_REF
 HEX_COLOR_CHINA_DOMINANT = COLOR_CHINA_REF
 
+# Reporter Pair: nama reporter sesuai kolom Country di data. Reporter pertama = rasio 0 (warna kiri skala),
+# reporter kedua = rasio 1 (warna kanan). Reporter tanpa entri di REPORTER_DISPLAY memakai nama lengkap
+# dan warna sisi pasangannya.
+DEFAULT_REPORTER_PAIR = ("United States", "China")
+REPORTER_DISPLAY = {
+    "United States": {"label": "US", "color": COLOR_US_REF},
+    "China": {"label": "China", "color": COLOR_CHINA_REF},
+}
+REPORTER_SIDE_COLORS = (HEX_COLOR_US_DOMINANT, HEX_COLOR_CHINA_DOMINANT)
+
 COLOR_BORDER = '#181818'
 OCEAN_COLOR = PAGE_BG_COLOR
 
 # Data Paths
-TRADE_DATA_PATH = 'src/data/cleaned_trade_data.csv'
-GEOJSON_URL = 'https://raw.githubusercontent.com/python-visualization/folium/master/examples/data/world-countries.json'
+TRADE_DATA_PATH = 'src/data/cleaned_trade_data' # Folder Parquet hasil data/data_transformator.py
+CACHE_DIR = 'src/data/.cache'
+COUNTRY_DIMENSION_PATH = 'src/data/countries.csv' # Dimensi negara ISO3: nama, benua, dan nama-nama sumber (dipisah '|')
+GEOJSON_PATH = 'src/data/world_countries.v2.geojson.gz'
+GEOJSON_URL = None # Opsional: URL GeoJSON remote untuk menggantikan aset lokal di GEOJSON_PATH
+GEOJSON_TIMEOUT_SECONDS = 5
+
+# Trade Cube (reporter x partner x year x flow). Jika float64 melebihi anggaran, cube disimpan sebagai float32.
+TRADE_CUBE_MEMORY_BUDGET_MB = 512
+TRADE_STORE_MAX_ENTRIES = 4 # Store read-only (pasangan reporter x versi data) yang disimpan bersama oleh semua sesi
+
+# Rerun Timing: "log" menulis satu baris log JSON per rerun, "panel" juga menampilkan panel debug.
+# Query parameter (misalnya ?timing=panel) mengalahkan environment variable.
+RERUN_TIMING_ENV_VAR = "DASHBOARD_TIMING"
+RERUN_TIMING_QUERY_PARAM = "timing"
+
+# Figure Cache (LRU, dibagi semua sesi dalam satu proses)
+FIGURE_CACHE_MAX_ENTRIES = 32
+
+# Prebuilt Views: artefak hasil `python src/prebuild_views.py`. Jika manifest cocok dengan data saat ini,
+# app menyajikan artefak ini dan hanya merender secara live untuk view yang tidak ada di manifest.
+PREBUILT_VIEWS_DIR = 'src/data/prebuilt'
+USE_PREBUILT_VIEWS = True
+PREBUILD_WORKERS = None # None: satu worker per CPU
+
+# JSON API (python src/api.py)
+API_HOST = "127.0.0.1"
+API_PORT = 8502
 
 # Map Settings
 INITIAL_YEAR_OFFSET = 0 # 0 untuk tahun terakhir, 1 untuk tahun kedua terakhir, dst.
-YEARS_RANGE = range(2001, 2025)
+YEARS_RANGE = range(2001, 2025) # Hanya fallback; tahun yang dipakai dideteksi dari kolom tahun di data
+MAP_SINGLE_FLOW_TRACE = True # False: satu trace per flow (GeoJSON ikut terkirim tiga kali)
 
 
 # --- Trade Flow Options ---
@@ -39,11 +76,26 @@ DEFAULT_TRADE_FLOW_DISPLAY = "Two-way trade"
 
 SORT_ORDER_OPTIONS = ["Descending", "Ascending"]
 
+# Line Chart Settings (tombol view di dalam figure; berpindah view tidak memicu rerun)
+LINE_CHART_VIEW_OPTIONS = ["Exports", "Imports", "Exports & Imports", "Trade Balance"]
+DEFAULT_LINE_CHART_VIEW = "Exports"
+
 # Default Table Settings
 DEFAULT_TABLE_YEAR = 2024
 DEFAULT_TABLE_CONTINENT = "World"
 DEFAULT_TABLE_SORT_ORDER = "Descending"
 TOP_N_COUNTRIES = 10
+TABLE_RENDER_MODE = "html" # "html": satu elemen tabel HTML, "columns": st.columns per baris
+PROPORTION_GLYPH_CACHE_SIZE = 4096
+
+# Geometry Levels (dari paling kasar ke paling detail): toleransi simplifikasi dan grid kuantisasi dalam derajat.
+# Level dipilih dari lebar area yang ditampilkan dibanding MAP_WIDTH_PX, lihat data_loader.select_geometry_level.
+MAP_WIDTH_PX = 1200
+GEOMETRY_LEVELS = {
+    "low": {"tolerance": 0.25, "grid_size": 0.01},
+    "medium": {"tolerance": 0.05, "grid_size": 0.001},
+    "full": {"tolerance": 0.0, "grid_size": 0.0},
+}
 
 # Continent Bounds (lon_min, lon_max, lat_min, lat_max)
 CONTINENT_BOUNDS = {
@@ -74,220 +126,6 @@ CONTINENT_OPTIONS = {
     "Oceania": "OC"
 }
 
-COUNTRY_TO_CONTINENT_MAP = {
-    # Asia (AS)
-    "Afghanistan": ("AS", "Asia"), # Dari GeoJSON, 'Afghanistan, Islamic Republic of' di df_dominance setelah mapping jadi 'Afghanistan'
-    "Bahrain, Kingdom of": ("AS", "Asia"), # Contoh, perlu disesuaikan
-    "Bangladesh": ("AS", "Asia"),
-    "Bhutan": ("AS", "Asia"),
-    "Brunei": ("AS", "Asia"), # 'Brunei Darussalam' -> 'Brunei'
-    "Cambodia": ("AS", "Asia"),
-    "China": ("AS", "Asia"),
-    "Cyprus": ("AS", "Asia"), # Geografis di Asia, politik bisa EU
-    "Georgia": ("AS", "Asia"), # Bisa juga Eropa
-    "India": ("AS", "Asia"),
-    "Indonesia": ("AS", "Asia"),
-    "Iran": ("AS", "Asia"), # 'Iran, Islamic Republic of' -> 'Iran'
-    "Iraq": ("AS", "Asia"),
-    "Israel": ("AS", "Asia"),
-    "Japan": ("AS", "Asia"),
-    "Jordan": ("AS", "Asia"),
-    "Kazakhstan": ("AS", "Asia"), # 'Kazakhstan, Republic of' -> 'Kazakhstan' (sebagian di Eropa)
-    "North Korea": ("AS", "Asia"), # "Korea, Democratic People's Republic of" -> "North Korea"
-    "South Korea": ("AS", "Asia"), # "Korea, Republic of" -> "South Korea"
-    "Kuwait": ("AS", "Asia"),
-    "Kyrgyzstan": ("AS", "Asia"), # 'Kyrgyz Republic' -> 'Kyrgyzstan'
-    "Laos": ("AS", "Asia"), # "Lao People's Democratic Republic" -> "Laos"
-    "Lebanon": ("AS", "Asia"),
-    "Malaysia": ("AS", "Asia"),
-    "Maldives": ("AS", "Asia"),
-    "Mongolia": ("AS", "Asia"),
-    "Myanmar": ("AS", "Asia"), # Dulu Burma
-    "Nepal": ("AS", "Asia"),
-    "Oman": ("AS", "Asia"),
-    "Pakistan": ("AS", "Asia"),
-    "Philippines": ("AS", "Asia"),
-    "Qatar": ("AS", "Asia"),
-    "Saudi Arabia": ("AS", "Asia"),
-    "Singapore": ("AS", "Asia"),
-    "Sri Lanka": ("AS", "Asia"),
-    "Syria": ("AS", "Asia"), # 'Syrian Arab Republic' -> 'Syria'
-    "Taiwan": ("AS", "Asia"), # 'Taiwan Province of China' -> 'Taiwan'
-    "Tajikistan": ("AS", "Asia"), # 'Tajikistan, Republic of' -> 'Tajikistan'
-    "Thailand": ("AS", "Asia"),
-    "Timor-Leste": ("AS", "Asia"), # 'Timor-Leste, Democratic Republic of' -> 'Timor-Leste' (Oceania?)
-    "Turkey": ("AS", "Asia"), # 'Türkiye, Republic of' -> 'Turkey' (sebagian di Eropa)
-    "Turkmenistan": ("AS", "Asia"),
-    "United Arab Emirates": ("AS", "Asia"),
-    "Uzbekistan": ("AS", "Asia"), # 'Uzbekistan, Republic of' -> 'Uzbekistan'
-    "Vietnam": ("AS", "Asia"),
-    "Yemen": ("AS", "Asia"), # 'Yemen, Republic of' -> 'Yemen'
-    "West Bank and Gaza": ("AS", "Asia"), # Atau "West Bank" saja tergantung mapping GeoJSON Anda
-
-    # Eropa (EU)
-    "Albania": ("EU", "Europe"),
-    "Armenia": ("EU", "Europe"), # 'Armenia, Republic of' -> 'Armenia' (bisa juga Asia)
-    "Austria": ("EU", "Europe"),
-    "Azerbaijan": ("EU", "Europe"), # 'Azerbaijan, Republic of' -> 'Azerbaijan' (bisa juga Asia)
-    "Belarus": ("EU", "Europe"), # 'Belarus, Republic of' -> 'Belarus'
-    "Belgium": ("EU", "Europe"),
-    "Bosnia and Herzegovina": ("EU", "Europe"),
-    "Bulgaria": ("EU", "Europe"),
-    "Croatia": ("EU", "Europe"), # 'Croatia, Republic of' -> 'Croatia'
-    "Czechia": ("EU", "Europe"), # 'Czech Republic' -> 'Czechia'
-    "Denmark": ("EU", "Europe"),
-    "Estonia": ("EU", "Europe"), # 'Estonia, Republic of' -> 'Estonia'
-    "Faroe Islands": ("EU", "Europe"), # Bagian dari Denmark
-    "Finland": ("EU", "Europe"),
-    "France": ("EU", "Europe"),
-    "Germany": ("EU", "Europe"),
-    "Gibraltar": ("EU", "Europe"), # Wilayah Inggris
-    "Greece": ("EU", "Europe"),
-    "Hungary": ("EU", "Europe"),
-    "Iceland": ("EU", "Europe"),
-    "Ireland": ("EU", "Europe"),
-    "Italy": ("EU", "Europe"),
-    "Kosovo": ("EU", "Europe"), # 'Kosovo, Republic of' -> 'Kosovo'
-    "Latvia": ("EU", "Europe"), # 'Latvia, Republic of' -> 'Latvia'
-    "Lithuania": ("EU", "Europe"), # 'Lithuania, Republic of' -> 'Lithuania'
-    "Luxembourg": ("EU", "Europe"),
-    "Malta": ("EU", "Europe"),
-    "Moldova": ("EU", "Europe"), # 'Moldova, Republic of' -> 'Moldova'
-    "Montenegro": ("EU", "Europe"),
-    "Netherlands": ("EU", "Europe"), # 'Netherlands, The' -> 'Netherlands'
-    "North Macedonia": ("EU", "Europe"), # 'North Macedonia, Republic of' -> 'North Macedonia' (Macedonia di GeoJSON?)
-    "Norway": ("EU", "Europe"),
-    "Poland": ("EU", "Europe"), # 'Poland, Republic of' -> 'Poland'
-    "Portugal": ("EU", "Europe"),
-    "Romania": ("EU", "Europe"),
-    "Russia": ("EU", "Europe"), # 'Russian Federation' -> 'Russia' (sebagian besar Asia)
-    "San Marino, Republic of": ("EU", "Europe"), # San Marino di GeoJSON
-    "Serbia": ("EU", "Europe"), # 'Serbia, Republic of' -> 'Serbia'
-    "Slovakia": ("EU", "Europe"), # 'Slovak Republic' -> 'Slovakia'
-    "Slovenia": ("EU", "Europe"), # 'Slovenia, Republic of' -> 'Slovenia'
-    "Spain": ("EU", "Europe"),
-    "Sweden": ("EU", "Europe"),
-    "Switzerland": ("EU", "Europe"),
-    "Ukraine": ("EU", "Europe"),
-    "United Kingdom": ("EU", "Europe"),
-    "Holy See": ("EU", "Europe"), # Vatikan
-
-    # Afrika (AF)
-    "Algeria": ("AF", "Africa"),
-    "Angola": ("AF", "Africa"),
-    "Benin": ("AF", "Africa"),
-    "Botswana": ("AF", "Africa"),
-    "Burkina Faso": ("AF", "Africa"),
-    "Burundi": ("AF", "Africa"),
-    "Cabo Verde": ("AF", "Africa"),
-    "Cameroon": ("AF", "Africa"),
-    "Central African Republic": ("AF", "Africa"),
-    "Chad": ("AF", "Africa"),
-    "Comoros, Union of the": ("AF", "Africa"), # Comoros di GeoJSON
-    "Democratic Republic of the Congo": ("AF", "Africa"), # 'Congo, Democratic Republic of the' -> 'Democratic Republic of the Congo'
-    "Republic of Congo": ("AF", "Africa"), # 'Congo, Republic of' -> 'Republic of Congo'
-    "Ivory Coast": ("AF", "Africa"), # "Côte d'Ivoire" -> "Ivory Coast"
-    "Djibouti": ("AF", "Africa"),
-    "Egypt": ("AF", "Africa"), # 'Egypt, Arab Republic of' -> 'Egypt'
-    "Equatorial Guinea": ("AF", "Africa"),
-    "Eritrea": ("AF", "Africa"), # 'Eritrea, The State of' -> 'Eritrea'
-    "Eswatini": ("AF", "Africa"), # 'Eswatini, Kingdom of' -> 'Eswatini' (dulu Swaziland)
-    "Ethiopia": ("AF", "Africa"), # 'Ethiopia, The Federal Democratic Republic of' -> 'Ethiopia'
-    "Gabon": ("AF", "Africa"),
-    "Gambia": ("AF", "Africa"),
-    "Ghana": ("AF", "Africa"),
-    "Guinea": ("AF", "Africa"),
-    "Guinea-Bissau": ("AF", "Africa"), # Guinea Bissau di GeoJSON
-    "Kenya": ("AF", "Africa"),
-    "Lesotho": ("AF", "Africa"), # 'Lesotho, Kingdom of' -> 'Lesotho'
-    "Liberia": ("AF", "Africa"),
-    "Libya": ("AF", "Africa"),
-    "Madagascar": ("AF", "Africa"), # 'Madagascar, Republic of' -> 'Madagascar'
-    "Malawi": ("AF", "Africa"),
-    "Mali": ("AF", "Africa"),
-    "Mauritania": ("AF", "Africa"), # 'Mauritania, Islamic Republic of' -> 'Mauritania'
-    "Mauritius": ("AF", "Africa"),
-    "Morocco": ("AF", "Africa"),
-    "Mozambique": ("AF", "Africa"), # 'Mozambique, Republic of' -> 'Mozambique'
-    "Namibia": ("AF", "Africa"),
-    "Niger": ("AF", "Africa"),
-    "Nigeria": ("AF", "Africa"),
-    "Rwanda": ("AF", "Africa"),
-    "São Tomé and Príncipe, Democratic Republic of": ("AF", "Africa"), # Sao Tome and Principe di GeoJSON
-    "Senegal": ("AF", "Africa"),
-    "Seychelles": ("AF", "Africa"),
-    "Sierra Leone": ("AF", "Africa"),
-    "Somalia": ("AF", "Africa"),
-    "South Africa": ("AF", "Africa"),
-    "South Sudan": ("AF", "Africa"), # 'South Sudan, Republic of' -> 'South Sudan'
-    "Sudan": ("AF", "Africa"),
-    "Tanzania": ("AF", "Africa"), # 'Tanzania, United Republic of' -> 'Tanzania'
-    "Togo": ("AF", "Africa"),
-    "Tunisia": ("AF", "Africa"),
-    "Uganda": ("AF", "Africa"),
-    "Zambia": ("AF", "Africa"),
-    "Zimbabwe": ("AF", "Africa"),
-    "Western Sahara": ("AF", "Africa"), # Mungkin ada di data Anda
-
-    # Amerika Utara (NA)
-    "Antigua and Barbuda": ("NA", "North America"),
-    "The Bahamas": ("NA", "North America"), # 'Bahamas, The' -> 'The Bahamas'
-    "Barbados": ("NA", "North America"),
-    "Belize": ("NA", "North America"),
-    "Canada": ("NA", "North America"),
-    "Costa Rica": ("NA", "North America"),
-    "Cuba": ("NA", "North America"),
-    "Dominica": ("NA", "North America"),
-    "Dominican Republic": ("NA", "North America"),
-    "El Salvador": ("NA", "North America"),
-    "Greenland": ("NA", "North America"), # Bagian dari Denmark
-    "Grenada": ("NA", "North America"),
-    "Guatemala": ("NA", "North America"),
-    "Haiti": ("NA", "North America"),
-    "Honduras": ("NA", "North America"),
-    "Jamaica": ("NA", "North America"),
-    "Mexico": ("NA", "North America"),
-    "Nicaragua": ("NA", "North America"),
-    "Panama": ("NA", "North America"),
-    "St. Kitts and Nevis": ("NA", "North America"),
-    "St. Lucia": ("NA", "North America"),
-    "St. Vincent and the Grenadines": ("NA", "North America"),
-    "Trinidad and Tobago": ("NA", "North America"),
-    "United States of America": ("NA", "North America"), # 'United States' -> 'United States of America'
-
-    # Amerika Selatan (SA)
-    "Argentina": ("SA", "South America"),
-    "Bolivia": ("SA", "South America"),
-    "Brazil": ("SA", "South America"),
-    "Chile": ("SA", "South America"),
-    "Colombia": ("SA", "South America"),
-    "Ecuador": ("SA", "South America"),
-    "Guyana": ("SA", "South America"),
-    "Paraguay": ("SA", "South America"),
-    "Peru": ("SA", "South America"),
-    "Suriname": ("SA", "South America"),
-    "Uruguay": ("SA", "South America"),
-    "Venezuela": ("SA", "South America"), # 'Venezuela, República Bolivariana de' -> 'Venezuela'
-    "Falkland Islands": ("SA", "South America"), # 'Falkland Islands (Malvinas)' -> 'Falkland Islands'
-
-    # Oceania (OC)
-    "Australia": ("OC", "Oceania"),
-    "Fiji": ("OC", "Oceania"),
-    "Kiribati": ("OC", "Oceania"),
-    "Marshall Islands, Republic of the": ("OC", "Oceania"),
-    "Federated States of Micronesia": ("OC", "Oceania"),
-    "Nauru, Republic of": ("OC", "Oceania"),
-    "New Caledonia": ("OC", "Oceania"),
-    "New Zealand": ("OC", "Oceania"),
-    "Palau, Republic of": ("OC", "Oceania"),
-    "Papua New Guinea": ("OC", "Oceania"),
-    "Samoa": ("OC", "Oceania"),
-    "Solomon Islands": ("OC", "Oceania"),
-    "Tonga": ("OC", "Oceania"),
-    "Tuvalu": ("OC", "Oceania"),
-    "Vanuatu": ("OC", "Oceania"),
-}
-
 PLOTLY_CONFIG = {
     'displayModeBar': False,
     'scrollZoom': False,
@@ -1,8 +1,14 @@
+import glob
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-data = pd.read_csv("raw_trade_data.csv")
-
-data = data.drop(columns=['DATASET', 'SERIES_CODE', 'OBS_MEASURE'])
+# Transformasi raw -> clean secara streaming: CSV dibaca per chunk dengan dtype eksplisit dan setiap
+# chunk langsung ditulis sebagai satu file Parquet, sehingga memori puncak hanya sebesar satu chunk.
+INPUT_PATH = "raw_trade_data.csv"
+OUTPUT_DIR = "cleaned_trade_data"
+CHUNK_ROWS = 100_000
 
 country_map = {
     'United States': 'United States',
@@ -14,14 +20,43 @@ trade_map = {
     'Imports of goods, Cost insurance freight (CIF), US dollar': 'Import'
 }
 
-data['COUNTRY'] = data['COUNTRY'].replace(country_map)
-data['COUNTERPART_COUNTRY'] = data['COUNTERPART_COUNTRY'].replace(country_map)
-data['INDICATOR'] = data['INDICATOR'].replace(trade_map)
-
-data = data.rename(columns={
+column_renames = {
     'COUNTRY': 'Country',
     'COUNTERPART_COUNTRY': 'Partner',
     'INDICATOR': 'Trade_Type'
-})
+}
+
+def map_values(series, mapping):
+    # Lookup hanya dilakukan sekali per nilai unik, lalu disebar kembali lewat kode integer.
+    codes, uniques = pd.factorize(series)
+    mapped_uniques = pd.Index(uniques).map(lambda value: mapping.get(value, value))
+    return pd.Series(mapped_uniques.take(codes), index=series.index).where(codes >= 0)
+
+header = pd.read_csv(INPUT_PATH, nrows=0).columns
+year_columns = [col for col in header if len(col) == 4 and col.isdigit()]
+string_columns = list(column_renames)
+
+schema = pa.schema(
+    [(column_renames[col], pa.string()) for col in ['COUNTRY', 'INDICATOR', 'COUNTERPART_COUNTRY']]
+    + [(year, pa.float64()) for year in year_columns]
+)
+
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+for old_part in glob.glob(os.path.join(OUTPUT_DIR, "part-*.parquet")):
+    os.remove(old_part)
+
+reader = pd.read_csv(
+    INPUT_PATH,
+    usecols=string_columns + year_columns,
+    dtype={**{col: 'string' for col in string_columns}, **{year: 'float64' for year in year_columns}},
+    chunksize=CHUNK_ROWS
+)
+for chunk_number, chunk in enumerate(reader):
+    chunk['COUNTRY'] = map_values(chunk['COUNTRY'], country_map)
+    chunk['COUNTERPART_COUNTRY'] = map_values(chunk['COUNTERPART_COUNTRY'], country_map)
+    chunk['INDICATOR'] = map_values(chunk['INDICATOR'], trade_map)
 
-data.to_csv("cleaned_trade_data.csv", index=False)
\ No newline at end of file
+    chunk = chunk.rename(columns=column_renames)[schema.names]
+    # Metadata pandas dibuang agar pembaca mendapat tipe dari skema Parquet, bukan dtype chunk ini.
+    table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False).replace_schema_metadata()
+    pq.write_table(table, os.path.join(OUTPUT_DIR, f"part-{chunk_number:05d}.parquet"))
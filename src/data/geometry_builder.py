@@ -0,0 +1,46 @@
+import gzip
+import json
+import sys
+import requests
+
+# Membangun aset geometri lokal yang dibundel bersama aplikasi (dijalankan dari folder src/data).
+# Sumber bisa berupa URL atau path file GeoJSON; hasilnya GeoJSON ringkas ber-gzip dengan versi di nama file.
+GEOJSON_SOURCE_URL = 'https://raw.githubusercontent.com/python-visualization/folium/master/examples/data/world-countries.json'
+GEOMETRY_VERSION = 2
+COORDINATE_PRECISION = 5
+
+# Feature tanpa kode ISO3 resmi di sumber (id '-99'); id dipakai sebagai featureidkey peta.
+ISO3_OVERRIDES = {
+    'Kosovo': 'XKX',
+}
+
+def round_coordinates(coords):
+    if isinstance(coords[0], (int, float)):
+        return [round(c, COORDINATE_PRECISION) for c in coords]
+    return [round_coordinates(c) for c in coords]
+
+source = sys.argv[1] if len(sys.argv) > 1 else GEOJSON_SOURCE_URL
+if source.startswith(("http://", "https://")):
+    response = requests.get(source, timeout=30)
+    response.raise_for_status()
+    geojson = response.json()
+else:
+    with open(source, encoding="utf-8") as f:
+        geojson = json.load(f)
+
+features = []
+for feature in sorted(geojson['features'], key=lambda f: f['properties']['name']):
+    features.append({
+        "type": "Feature",
+        "id": ISO3_OVERRIDES.get(feature['properties']['name'], feature.get('id')),
+        "properties": {"name": feature['properties']['name']},
+        "geometry": {
+            "type": feature['geometry']['type'],
+            "coordinates": round_coordinates(feature['geometry']['coordinates'])
+        }
+    })
+
+output_path = f"world_countries.v{GEOMETRY_VERSION}.geojson.gz"
+payload = json.dumps({"type": "FeatureCollection", "features": features}, separators=(',', ':'))
+with gzip.GzipFile(output_path, "wb", mtime=0) as f:
+    f.write(payload.encode("utf-8"))
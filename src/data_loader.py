@@ -2,9 +2,19 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import requests
+import shapely
+from shapely.geometry import shape, mapping
 import config
 import base64
+import gzip
+import hashlib
+import json
+import os
+import math
+from collections import namedtuple
 
+# Foto penulis dibaca dan di-encode sekali per proses, bukan pada setiap rerun penuh.
+@st.cache_data
 def image_to_base64(image_path):
     try:
         with open(image_path, "rb") as image_file:
@@ -22,129 +32,497 @@ def format_trade_value(value):
         return f"${value / 1_000:.2f}B"
     return f"${value:.2f}M"
 
-@st.cache_data
-def load_trade_data():
+WHOLE_NUMBER_STRINGS = np.array([str(i) for i in range(1000)])
+CENT_STRINGS = np.array([f".{i:02d}" for i in range(100)])
+
+def format_trade_values(values):
+    # Versi array dari format_trade_value dengan ambang T/B/M yang sama. Nilai yang sudah diskalakan
+    # dibulatkan ke sen lalu dirangkai dari tabel string; nilai >= 1000, dekat titik tengah pembulatan,
+    # atau tak hingga diformat dengan "%.2f" agar hasilnya identik dengan versi skalar.
+    values = np.asarray(values, dtype=float)
+    abs_values = np.abs(values)
+    is_trillion = abs_values >= 1_000_000
+    is_billion = ~is_trillion & (abs_values >= 1_000)
+    scaled = np.where(is_trillion, values / 1_000_000, np.where(is_billion, values / 1_000, values))
+
+    scaled_cents = np.abs(scaled) * 100
+    with np.errstate(invalid='ignore'):
+        fraction = scaled_cents - np.floor(scaled_cents)
+        needs_fallback = ~(scaled_cents < 99_999.5) | (np.abs(fraction - 0.5) < 1e-6)
+    cents = np.rint(np.where(needs_fallback, 0, scaled_cents)).astype(np.int64)
+
+    numbers = np.strings.add(WHOLE_NUMBER_STRINGS.take(cents // 100), CENT_STRINGS.take(cents % 100))
+    numbers = np.strings.add(np.where(np.signbit(scaled), "$-", "$"), numbers)
+    if needs_fallback.any():
+        fallback_numbers = np.array(["$%.2f" % value for value in scaled[needs_fallback]])
+        numbers = numbers.astype(np.promote_types(numbers.dtype, fallback_numbers.dtype))
+        numbers[needs_fallback] = fallback_numbers
+
+    formatted = np.strings.add(numbers, np.where(is_trillion, "T", np.where(is_billion, "B", "M")))
+    formatted[np.isnan(values) | (values == 0)] = "$0"
+    return formatted
+
+# Dinaikkan setiap kali perhitungan atau skema frame/array di cache disk berubah, agar CACHE_DIR yang persisten
+# tidak menyajikan hasil dari kode versi lama setelah deploy.
+CACHE_FORMAT_VERSION = 2
+
+def compute_cache_key(*parts):
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+    return hasher.hexdigest()[:16]
+
+def source_files(path):
+    # Data bisa berupa satu file atau folder Parquet berisi beberapa part file.
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".parquet"))
+    return [path]
+
+def file_content_hash(path):
+    hasher = hashlib.sha256()
+    for file_path in source_files(path):
+        hasher.update(os.path.basename(file_path).encode("utf-8"))
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(block)
+    return hasher.hexdigest()
+
+def read_trade_table(path):
+    if os.path.isdir(path) or path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def cache_file_path(name, key, extension):
+    return os.path.join(config.CACHE_DIR, f"{name}-{key}.{extension}")
+
+def write_cache_file(name, key, extension, writer):
+    # Tulis ke file sementara lalu rename agar proses lain tidak membaca file setengah jadi.
+    cache_path = cache_file_path(name, key, extension)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(config.CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            writer(f)
+        os.replace(tmp_path, cache_path)
+        for old_file in os.listdir(config.CACHE_DIR):
+            if old_file.startswith(f"{name}-") and old_file.endswith(f".{extension}") and old_file != os.path.basename(cache_path):
+                os.remove(os.path.join(config.CACHE_DIR, old_file))
+    except (OSError, ValueError, ImportError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_cached_frame(name, key):
+    cache_path = cache_file_path(name, key, "parquet")
+    if not os.path.exists(cache_path):
+        return None
     try:
-        df = pd.read_csv(config.TRADE_DATA_PATH)
+        return pd.read_parquet(cache_path)
+    except (OSError, ValueError, ImportError):
+        return None
+
+def write_cached_frame(name, key, df):
+    write_cache_file(name, key, "parquet", lambda f: df.to_parquet(f, index=False))
+
+def read_cached_arrays(name, key):
+    cache_path = cache_file_path(name, key, "npz")
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as npz:
+            return {array_name: npz[array_name] for array_name in npz.files}
+    except (OSError, ValueError, KeyError):
+        return None
+
+def write_cached_arrays(name, key, arrays):
+    # np.savez mem-pickle array object, dan array seperti itu tidak bisa dibaca lagi tanpa allow_pickle.
+    object_arrays = [array_name for array_name, array in arrays.items() if array.dtype == object]
+    if object_arrays:
+        raise TypeError(f"Cannot cache object arrays without pickling: {', '.join(object_arrays)}.")
+    write_cache_file(name, key, "npz", lambda f: np.savez(f, **arrays))
+
+# Dimensi negara kanonik: baris ke-i di COUNTRY_DIMENSION_PATH adalah kode integer i. Partner di data
+# (nama IMF), feature GeoJSON (id ISO3), dan benua semuanya di-join lewat kode ini.
+CountryDimension = namedtuple('CountryDimension', ['iso3', 'names', 'continent_codes', 'continent_names', 'codes_by_name'])
+
+@st.cache_resource(max_entries=2)
+def load_country_dimension(data_version=None):
+    # data_version hanya kunci cache: dimensi dibaca ulang saat file sumber berubah.
+    # keep_default_na=False: kode benua "NA" (North America) bukan nilai kosong.
+    df_countries = pd.read_csv(config.COUNTRY_DIMENSION_PATH, dtype=str, keep_default_na=False)
+    codes_by_name = {}
+    for code, (name, source_names) in enumerate(zip(df_countries['name'], df_countries['source_names'])):
+        codes_by_name[name] = code
+        for source_name in filter(None, source_names.split('|')):
+            codes_by_name[source_name] = code
+    return CountryDimension(
+        iso3=df_countries['iso3'].to_numpy(dtype=object),
+        names=df_countries['name'].to_numpy(dtype=object),
+        continent_codes=df_countries['continent_code'].to_numpy(dtype=object),
+        continent_names=df_countries['continent_name'].to_numpy(dtype=object),
+        codes_by_name=codes_by_name
+    )
+
+def get_country_dimension():
+    return load_country_dimension(get_data_version())
+
+def country_dimension_version():
+    return file_content_hash(config.COUNTRY_DIMENSION_PATH)
+
+def country_codes_for_names(names):
+    # Lookup sekali per nama unik; -1 untuk nama yang bukan negara (agregat seperti 'World' atau 'Europe').
+    codes_by_name = get_country_dimension().codes_by_name
+    name_codes, unique_names = pd.factorize(pd.Series(names, dtype=object))
+    unique_codes = np.array([codes_by_name.get(name, -1) for name in unique_names] + [-1], dtype='int32')
+    return unique_codes[name_codes]
+
+def country_codes_for_iso3(iso3_values):
+    return pd.Index(get_country_dimension().iso3).get_indexer(pd.Index(iso3_values, dtype=object)).astype('int32')
+
+TRADE_FLOW_PROCESSING_ORDER = ["Total", "Import", "Export"]
+
+# Satu-satunya representasi data perdagangan di memori: matriks bilateral penuh N reporter x M partner,
+# values[reporter, partner, year, flow] dengan flow mengikuti TRADE_FLOW_PROCESSING_ORDER. Peta, line chart,
+# dan tabel untuk pasangan reporter mana pun diturunkan dari sini.
+TradeCube = namedtuple('TradeCube', ['reporters', 'partners', 'years', 'flows', 'values'])
+
+def trade_data_cache_key():
+    return compute_cache_key(CACHE_FORMAT_VERSION, file_content_hash(config.TRADE_DATA_PATH), country_dimension_version())
+
+def detect_year_columns(columns):
+    return sorted(int(col) for col in map(str, columns) if len(col) == 4 and col.isdigit())
+
+def get_data_version():
+    # Versi murah (tanpa membaca isi file) untuk kunci cache figure: berubah jika data atau geometri berubah.
+    source_stats = []
+    for path in (config.TRADE_DATA_PATH, config.GEOJSON_PATH, config.COUNTRY_DIMENSION_PATH):
+        try:
+            for file_path in source_files(path):
+                stat = os.stat(file_path)
+                source_stats.append((file_path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            source_stats.append((path, None, None))
+    return compute_cache_key(
+        source_stats, config.GEOJSON_URL, config.GEOMETRY_LEVELS
+    )
+
+def select_cube_dtype(shape):
+    n_cells = math.prod(shape)
+    budget_bytes = config.TRADE_CUBE_MEMORY_BUDGET_MB * 1024 ** 2
+    for dtype in (np.float64, np.float32):
+        if n_cells * np.dtype(dtype).itemsize <= budget_bytes:
+            return dtype
+    raise MemoryError(
+        f"Trade cube {shape} needs {n_cells * 4 / 1024 ** 2:.0f} MB even as float32, "
+        f"above TRADE_CUBE_MEMORY_BUDGET_MB={config.TRADE_CUBE_MEMORY_BUDGET_MB}."
+    )
+
+def build_trade_cube(df, years=None):
+    if years is None:
+        years = detect_year_columns(df.columns)
+    years = np.array(years, dtype='int64')
+    # Nama disimpan sebagai unicode lebar tetap (bukan object) agar cube bisa di-cache ke .npz tanpa pickle.
+    reporters = np.sort(df['Country'].dropna().unique().astype(str))
+    partners = np.sort(df['Partner'].dropna().unique().astype(str))
+    cube_shape = (len(reporters), len(partners), len(years), len(TRADE_FLOW_PROCESSING_ORDER))
+    cube_dtype = select_cube_dtype(cube_shape)
+
+    values = df.reindex(columns=[str(y) for y in years]).to_numpy(dtype=cube_dtype)
+    values = np.nan_to_num(values, nan=0.0)
+
+    flow_idx = df['Trade_Type'].map({'Import': 1, 'Export': 2}).to_numpy()
+    valid = ~(pd.isna(flow_idx) | df['Country'].isna().to_numpy() | df['Partner'].isna().to_numpy())
+    reporter_idx = reporters.searchsorted(df['Country'].to_numpy()[valid].astype(str))
+    partner_idx = partners.searchsorted(df['Partner'].to_numpy()[valid].astype(str))
+
+    cube_values = np.zeros(cube_shape, dtype=cube_dtype)
+    np.add.at(
+        cube_values,
+        (reporter_idx, partner_idx, slice(None), flow_idx[valid].astype(int)),
+        values[valid]
+    )
+    cube_values[..., 0] = cube_values[..., 1] + cube_values[..., 2]
+    return make_trade_cube(reporters, partners, years, np.array(TRADE_FLOW_PROCESSING_ORDER), cube_values)
+
+def make_trade_cube(reporters, partners, years, flows, values):
+    for array in (reporters, partners, years, flows, values):
+        array.flags.writeable = False
+    return TradeCube(reporters, partners, years, flows, values)
+
+@st.cache_resource(max_entries=2)
+def load_trade_cube(data_version=None):
+    # data_version hanya kunci cache (lihat get_trade_cube); isi cube tetap divalidasi lewat hash isi file.
+    try:
+        cache_key = trade_data_cache_key()
     except FileNotFoundError:
         st.error(f"File '{config.TRADE_DATA_PATH}' tidak ditemukan.")
-        return pd.DataFrame(), []
+        return None
 
-    df_pivot = df.pivot_table(index=['Partner', 'Country'],
-                              columns='Trade_Type',
-                              values=[str(y) for y in config.YEARS_RANGE],
-                              aggfunc='sum').fillna(0)
-    
-    new_cols = []
-    for col_tuple in df_pivot.columns:
-        if isinstance(col_tuple, tuple) and len(col_tuple) == 2:
-            year_val, trade_type_val = col_tuple
-            new_cols.append(f"{year_val}_{trade_type_val}")
-        else: 
-            new_cols.append(str(col_tuple)) 
-    df_pivot.columns = new_cols
-    df_pivot = df_pivot.reset_index()
-
-    years_range_str = [str(y) for y in config.YEARS_RANGE]
-    
-    for year_col_num in years_range_str:
-        export_col = f'{year_col_num}_Export'
-        import_col = f'{year_col_num}_Import'
-        
-        df_pivot[export_col] = df_pivot.get(export_col, pd.Series(0, index=df_pivot.index))
-        df_pivot[import_col] = df_pivot.get(import_col, pd.Series(0, index=df_pivot.index))
-        
-        df_pivot[f'{year_col_num}_Total'] = df_pivot[export_col] + df_pivot[import_col]
+    cached_arrays = read_cached_arrays("cube", cache_key)
+    if cached_arrays is not None and set(cached_arrays) == set(TradeCube._fields):
+        return make_trade_cube(**cached_arrays)
 
-    trade_dominance_records = []
-    trade_flow_processing_map = {
-        "Total": "_Total", "Import": "_Import", "Export": "_Export"
-    }
+    try:
+        cube = build_trade_cube(read_trade_table(config.TRADE_DATA_PATH))
+    except MemoryError as e:
+        st.error(str(e))
+        return None
+    write_cached_arrays("cube", cache_key, cube._asdict())
+    return cube
 
-    for partner_country_raw in df_pivot['Partner'].unique():
-        df_partner_country_data = df_pivot[df_pivot['Partner'] == partner_country_raw]
-        for year_str in years_range_str:
-            for flow_type_key, col_suffix in trade_flow_processing_map.items():
-                data_col_name = f'{year_str}{col_suffix}'
-                
-                us_trade_series = df_partner_country_data[df_partner_country_data['Country'] == 'United States'].get(data_col_name)
-                china_trade_series = df_partner_country_data[df_partner_country_data['Country'] == 'China'].get(data_col_name)
-                
-                us_trade_val = us_trade_series.iloc[0] if us_trade_series is not None and not us_trade_series.empty else 0
-                china_trade_val = china_trade_series.iloc[0] if china_trade_series is not None and not china_trade_series.empty else 0
-                
-                total_us_china_trade = us_trade_val + china_trade_val
-                current_ratio = np.nan
-                if total_us_china_trade > 0:
-                    current_ratio = china_trade_val / total_us_china_trade
-                
-                trade_dominance_records.append({
-                    'Partner_Raw': partner_country_raw,
-                    'Year': int(year_str), 
-                    'Trade_Flow_Type': flow_type_key,
-                    'Ratio': current_ratio,
-                    'US_Trade': us_trade_val,
-                    'China_Trade': china_trade_val
-                })
-            
-    df_processed_dominance = pd.DataFrame(trade_dominance_records)
-
-    name_mapping = {
-        'Falkland Islands (Malvinas)': 'Falkland Islands', 'Equatorial Guinea, Republic of': 'Equatorial Guinea',
-        'Brunei Darussalam': 'Brunei', 'Congo, Democratic Republic of the': 'Democratic Republic of the Congo', 'Congo, Republic of': 'Republic of the Congo',
-        'Congo, Rep.': 'Republic of Congo', "Côte d'Ivoire": "Ivory Coast",
-        'Iran, Islamic Rep. of': 'Iran', "Korea, Democratic People's Republic of": 'North Korea',
-        'Korea, Republic of': 'South Korea', 'Lao PDR': 'Laos', 'Russian Federation': 'Russia',
-        'Syrian Arab Republic': 'Syria', 'Taiwan, China': 'Taiwan',
-        'Tanzania, United Republic of': 'Tanzania', 'Timor-Leste, Dem. Rep. of': 'Timor-Leste',
-        'Venezuela, Rep. Bolivariana de': 'Venezuela',
-        'Viet Nam': 'Vietnam', 'Yemen, Rep. of': 'Yemen',
-        'Egypt, Arab Rep.': 'Egypt', 'Gambia, The': 'Gambia', 'Kyrgyz Republic': 'Kyrgyzstan',
-        'Slovak Republic': 'Slovakia', 'Micronesia, Fed. Sts. of': 'Federated States of Micronesia',
-        'Bahamas, The': 'The Bahamas', 'Czech Republic': 'Czechia', 'Swaziland': 'Eswatini',
-        'United States': 'United States of America',
-        'Uzbekistan, Republic of': 'Uzbekistan',
-        'Kazakhstan, Republic of': 'Kazakhstan',
-        'Mauritania, Islamic Republic of': 'Mauritania',
-        'Poland, Republic of': 'Poland', 'Estonia, Republic of': 'Estonia', 
-        'Madagascar, Republic of' : 'Madagascar', 'Belarus, Republic of' : 'Belarus', 
-        'Netherlands, The' : 'Netherlands', 'Lithuania, Republic of': 'Lithuania', 
-        'Latvia, Republic of' : 'Latvia', 'Türkiye, Republic of' : 'Turkey', 
-        'Moldova, Republic of' : 'Moldova', 'North Macedonia, Republic of': 'North Macedonia', 
-        'Kosovo, Republic of' : 'Kosovo', 'Serbia, Republic of': 'Republic of Serbia',
-        'Slovenia, Republic of': 'Slovenia', 'Croatia, Republic of' : 'Croatia', 
-        'Timor-Leste, Democratic Republic of' : 'Timor-Leste',
-        'Taiwan Province of China' : 'Taiwan',
-        'Egypt, Arab Republic of' : 'Egypt', 
-        "Lao People's Democratic Republic" : 'Laos', 
-        'Armenia, Republic of' : 'Armenia',
-        'Azerbaijan, Republic of' : 'Azerbaijan', 
-        'Afghanistan, Islamic Republic of' : 'Afghanistan', 
-        'Tajikistan, Republic of' : 'Tajikistan', 
-        'Ethiopia, The Federal Democratic Republic of' : 'Ethiopia', 
-        'South Sudan, Republic of' : 'South Sudan', 
-        'Mozambique, Republic of': 'Mozambique',
-        'Lesotho, Kingdom of': 'Lesotho', 
-        'Sub-Saharan Africa (SSA)' : 'Western Sahara',
-        'Comoros, Union of the': 'Comoros',
-        'Eritrea, The State of': 'Eritrea',
-        'Eswatini, Kingdom of': 'Eswatini',
-        'Fiji, Republic of': 'Fiji',
-        'Marshall Islands, Republic of the': 'Marshall Islands',
-        'Nauru, Republic of': 'Nauru',
-        'Palau, Republic of': 'Palau',
-        'San Marino, Republic of': 'San Marino',
-        'São Tomé and Príncipe, Democratic Republic of': 'Sao Tome and Principe',
-        'Venezuela, República Bolivariana de': 'Venezuela',
-        'West Bank and Gaza': 'West Bank',
-        'Iran, Islamic Republic of' : 'Iran',
-        'Yemen, Republic of' : 'Yemen',
-        'Tanzania, United Republic of': 'United Republic of Tanzania'
-    }
-    df_processed_dominance['Partner'] = df_processed_dominance['Partner_Raw'].replace(name_mapping)
+def get_trade_cube():
+    # Sama seperti get_trade_store: cube dimuat ulang begitu file data berubah di disk.
+    return load_trade_cube(get_data_version())
+
+def reporter_position(cube, reporter_name):
+    # reporters terurut, jadi cukup binary search; -1 jika reporter tidak ada di data.
+    position = cube.reporters.searchsorted(reporter_name)
+    if position < len(cube.reporters) and cube.reporters[position] == reporter_name:
+        return int(position)
+    return -1
+
+def missing_reporters(cube, reporter_names):
+    return [reporter_name for reporter_name in reporter_names if reporter_position(cube, reporter_name) < 0]
+
+def missing_reporters_message(reporter_names):
+    return f"Reporter {', '.join(repr(name) for name in reporter_names)} is not in the trade data (check DEFAULT_REPORTER_PAIR)."
+
+def reporter_values(cube, reporter_name):
+    # Reporter yang tidak ada (misalnya salah ketik di config) bukan nol: semua partner akan tampak dikuasai sisi lain.
+    position = reporter_position(cube, reporter_name)
+    if position < 0:
+        raise ValueError(f"Reporter {reporter_name!r} is not in the trade data.")
+    return cube.values[position]
+
+def reporter_display(reporter_name, side=0):
+    display = config.REPORTER_DISPLAY.get(reporter_name, {})
+    return display.get("label", reporter_name), display.get("color", config.REPORTER_SIDE_COLORS[side])
+
+def reporter_partner_code(reporter_name):
+    # Kode negara reporter di dimensi negara, misalnya 'United States' -> kode USA.
+    return int(country_codes_for_names([reporter_name])[0])
+
+def pair_ratio(trade_a, trade_b):
+    # Rasio B / (A + B), NaN jika keduanya 0.
+    total_pair_trade = trade_a + trade_b
+    ratio = np.full_like(total_pair_trade, np.nan)
+    np.divide(trade_b, total_pair_trade, out=ratio, where=total_pair_trade > 0)
+    return ratio
+
+def compute_pair_dominance(cube, reporter_a, reporter_b):
+    # Array (partner x year x flow): nilai kedua reporter dan rasionya.
+    trade_a = reporter_values(cube, reporter_a)
+    trade_b = reporter_values(cube, reporter_b)
+    return trade_a, trade_b, pair_ratio(trade_a, trade_b)
+
+def axis_position(axis, value, axis_name):
+    positions = np.flatnonzero(axis == value)
+    if len(positions) == 0:
+        raise ValueError(f"{axis_name} {value!r} is not in the trade data.")
+    return int(positions[0])
 
-    df_processed_dominance.loc[df_processed_dominance['Partner'] == 'United States of America', 'Ratio'] = 0.0
-    df_processed_dominance.loc[df_processed_dominance['Partner'] == 'China', 'Ratio'] = 1.0
+def rank_reporter_against_rivals(cube, reporter, rivals, year, flow_key):
+    # Peringkat reporter di setiap partner dibanding sekumpulan rival (1 = mitra dagang terbesar).
+    # Reporter, rival, tahun, atau flow yang tidak ada di cube memunculkan ValueError.
+    rivals = [rival for rival in rivals if rival != reporter]
+    year_pos = axis_position(cube.years, year, "Year")
+    flow_pos = axis_position(cube.flows, flow_key, "Trade flow")
+    reporter_trade = reporter_values(cube, reporter)[:, year_pos, flow_pos]
+    if rivals:
+        rival_trade = np.stack([reporter_values(cube, rival)[:, year_pos, flow_pos] for rival in rivals])
+    else:
+        rival_trade = np.zeros((1, len(cube.partners)), dtype=cube.values.dtype)
+    top_rival_pos = rival_trade.argmax(axis=0)
+    total_trade = reporter_trade + rival_trade.sum(axis=0)
+    share = np.full_like(total_trade, np.nan)
+    np.divide(reporter_trade, total_trade, out=share, where=total_trade > 0)
+
+    return pd.DataFrame({
+        'Partner_Raw': cube.partners.astype(object),
+        'Rank': 1 + (rival_trade > reporter_trade).sum(axis=0),
+        'Share': share,
+        'Reporter_Trade': reporter_trade,
+        'Top_Rival': np.array(rivals, dtype=object)[top_rival_pos] if rivals else None,
+        'Top_Rival_Trade': rival_trade[top_rival_pos, np.arange(len(cube.partners))],
+    })
+
+def apply_reporter_ratios(ratio, country_codes, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Reporter sebagai partner selalu sepenuhnya di sisinya sendiri (A = 0, B = 1). Reporter tanpa kode negara
+    # (misalnya agregat seperti 'Euro Area') dilewati: kode -1 akan cocok dengan semua partner agregat.
+    for reporter_name, side_ratio in zip(reporter_pair, (0.0, 1.0)):
+        code = reporter_partner_code(reporter_name)
+        if code >= 0:
+            ratio[country_codes == code] = side_ratio
+    return ratio
+
+def full_precision_ratio(df, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Kolom Ratio di store hanya float32 (cukup untuk tampilan persen); untuk output numerik seperti API rasio
+    # dihitung ulang dari kolom nilai float64 dengan aturan reporter-sebagai-partner yang sama (berbasis kode negara).
+    ratio = pair_ratio(df['Reporter_A_Trade'].to_numpy(dtype='float64'), df['Reporter_B_Trade'].to_numpy(dtype='float64'))
+    # Frame tabel tidak membawa Country_Code; nama Partner di sana adalah nama dimensi yang kembali ke kode yang sama.
+    country_codes = df['Country_Code'].to_numpy() if 'Country_Code' in df.columns else country_codes_for_names(df['Partner'])
+    return apply_reporter_ratios(ratio, country_codes, reporter_pair)
+
+def compute_dominance_frame(cube, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    n_partners, n_years, n_flows = cube.values.shape[1:]
+    trade_a, trade_b, ratio = compute_pair_dominance(cube, *reporter_pair)
+
+    return pd.DataFrame({
+        'Partner_Raw': np.repeat(cube.partners.astype(object), n_years * n_flows),
+        'Year': np.tile(np.repeat(cube.years, n_flows), n_partners),
+        'Trade_Flow_Type': np.tile(cube.flows.astype(object), n_partners * n_years),
+        'Ratio': ratio.ravel(),
+        'Reporter_A_Trade': trade_a.ravel(),
+        'Reporter_B_Trade': trade_b.ravel()
+    })
+
+def compute_trend_frame(cube, reporter_names=config.DEFAULT_REPORTER_PAIR):
+    # Total per reporter/flow/tahun atas semua partner, urutan sama dengan groupby(['Country', 'Trade_Type', 'Year']).
+    records = []
+    flow_positions = {flow: i for i, flow in enumerate(cube.flows)}
+    for reporter_name in sorted(reporter_names):
+        yearly_totals = reporter_values(cube, reporter_name).sum(axis=0)
+        for trade_type in ('Export', 'Import'):
+            records.append(pd.DataFrame({
+                'Country': reporter_name,
+                'Trade_Type': trade_type,
+                'Year': cube.years,
+                'Value': yearly_totals[:, flow_positions[trade_type]]
+            }))
+    return pd.concat(records, ignore_index=True)
+
+def apply_partner_names(df_processed_dominance, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Country_Code adalah kunci join ke peta dan benua; nama agregat tetap dipakai apa adanya.
+    country_codes = country_codes_for_names(df_processed_dominance['Partner_Raw'])
+    df_processed_dominance['Country_Code'] = country_codes
+    df_processed_dominance['Partner'] = np.where(
+        country_codes >= 0, get_country_dimension().names[country_codes], df_processed_dominance['Partner_Raw'].to_numpy()
+    )
+
+    df_processed_dominance['Ratio'] = apply_reporter_ratios(
+        df_processed_dominance['Ratio'].to_numpy(copy=True), country_codes, reporter_pair
+    )
+    return df_processed_dominance
+
+def dominance_cache_name(reporter_pair):
+    # Setiap pasangan reporter punya nama cache sendiri agar tidak saling menghapus file lama.
+    return f"dominance_{compute_cache_key(list(reporter_pair))[:8]}"
+
+def year_partition_key(partners, pair_trade, year_pos, year, dimension_version, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Hanya irisan pasangan reporter untuk tahun ini, pada partner yang punya nilai bukan nol. Partner baru
+    # yang nol di tahun ini (atau reporter lain yang berubah) tidak membatalkan partisi tahun tersebut.
+    year_trade = np.ascontiguousarray(pair_trade[:, :, year_pos, :])
+    active = (year_trade != 0).any(axis=(0, 2))
+    hasher = hashlib.sha256()
+    hasher.update("\0".join(partners[active]).encode("utf-8"))
+    hasher.update(np.ascontiguousarray(year_trade[:, active]).tobytes())
+    return compute_cache_key(CACHE_FORMAT_VERSION, hasher.hexdigest(), dimension_version, year, list(reporter_pair))
+
+def dominance_rows(cube, partner_positions, year_positions, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    subcube = cube._replace(
+        partners=cube.partners[partner_positions], years=cube.years[year_positions],
+        values=cube.values[:, partner_positions][:, :, year_positions, :]
+    )
+    return apply_partner_names(compute_dominance_frame(subcube, reporter_pair), reporter_pair)
+
+def compute_dominance_incrementally(cube, reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # Setiap tahun disimpan sebagai partisi sendiri yang kuncinya hanya bergantung pada nilai pasangan reporter
+    # di tahun itu, sehingga tahun baru atau revisi hanya menghitung ulang tahun yang berubah.
+    years = [int(year) for year in cube.years]
+    all_partner_positions = np.arange(len(cube.partners))
+    pair_trade = np.stack([reporter_values(cube, reporter_name) for reporter_name in reporter_pair])
+    dimension_version = country_dimension_version()
+    partitions = {}
+    partition_keys = {}
+    changed_positions = []
+    cache_name = dominance_cache_name(reporter_pair)
+    for year_pos, year in enumerate(years):
+        partition_keys[year] = year_partition_key(cube.partners, pair_trade, year_pos, year, dimension_version, reporter_pair)
+        partition = read_cached_frame(f"{cache_name}_year{year}", partition_keys[year])
+        if partition is None:
+            changed_positions.append(year_pos)
+            continue
+        # Kunci yang sama menjamin partner yang hilang/bertambah sejak partisi ditulis bernilai nol di tahun ini:
+        # partner yang sudah tidak ada dibuang, partner baru diisi baris nol tanpa menghitung ulang seluruh tahun.
+        partition = partition[np.isin(partition['Partner_Raw'].to_numpy(dtype=str), cube.partners)]
+        missing_positions = all_partner_positions[~np.isin(cube.partners, partition['Partner_Raw'].to_numpy(dtype=str))]
+        if len(missing_positions):
+            partition = pd.concat(
+                [partition, dominance_rows(cube, missing_positions, [year_pos], reporter_pair)], ignore_index=True
+            )
+        partitions[year] = partition
+
+    if changed_positions:
+        df_changed = dominance_rows(cube, all_partner_positions, changed_positions, reporter_pair)
+        for year, partition in df_changed.groupby('Year', sort=False):
+            partition = partition.reset_index(drop=True)
+            partitions[int(year)] = partition
+            write_cached_frame(f"{cache_name}_year{year}", partition_keys[int(year)], partition)
+
+    if not partitions:
+        return pd.DataFrame(columns=['Partner_Raw', 'Year', 'Trade_Flow_Type', 'Ratio', 'Reporter_A_Trade', 'Reporter_B_Trade', 'Country_Code', 'Partner'])
+    # Urutan akhir tetap partner -> tahun -> flow seperti frame yang dihitung sekaligus.
+    df_processed_dominance = pd.concat([partitions[year] for year in years], ignore_index=True)
+    partner_order = np.argsort(df_processed_dominance['Partner_Raw'].to_numpy(), kind='stable')
+    return df_processed_dominance.iloc[partner_order].reset_index(drop=True)
+
+TradeDataStore = namedtuple('TradeDataStore', ['df_dominance', 'available_years', 'df_table', 'table_index'])
+
+# Skema ringkas untuk frame di store: dimensi string yang berulang di setiap baris menjadi categorical, tahun
+# muat di int16, dan rasio (0..1, hanya ditampilkan sebagai persen) cukup float32. Nilai perdagangan tetap
+# float64 karena data sumber berpresisi 1e-6 juta USD, di luar jangkauan float32 untuk nilai jutaan.
+COMPACT_COLUMN_DTYPES = {
+    'Partner': 'category',
+    'Partner_Raw': 'category',
+    'Trade_Flow_Type': 'category',
+    'Continent_Code': 'category',
+    'Continent_Name': 'category',
+    'Year': 'int16',
+    'Ratio': 'float32',
+}
+
+def compact_frame(df):
+    return df.astype({col: dtype for col, dtype in COMPACT_COLUMN_DTYPES.items() if col in df.columns})
+
+def memory_by_column(df):
+    # Byte per kolom termasuk isi string Python (deep), tanpa index.
+    return df.memory_usage(index=False, deep=True)
+
+def freeze_frame(df):
+    # Setiap kolom disalin sekali ke array NumPy read-only (tanpa konsolidasi blok), sehingga frame bisa
+    # dibagi ke semua sesi tanpa disalin; penulisan in-place gagal dengan ValueError, bukan merusak data bersama.
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            codes = df[col].cat.codes.to_numpy(copy=True)
+            codes.flags.writeable = False
+            columns[col] = pd.Categorical.from_codes(codes, dtype=df[col].dtype)
+            continue
+        values = df[col].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+def compute_trade_data(reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    reporter_pair = tuple(reporter_pair)
+    try:
+        cache_key = compute_cache_key(trade_data_cache_key(), list(reporter_pair))
+    except FileNotFoundError:
+        st.error(f"File '{config.TRADE_DATA_PATH}' tidak ditemukan.")
+        return pd.DataFrame(), []
+
+    cache_name = dominance_cache_name(reporter_pair)
+    df_processed_dominance = read_cached_frame(cache_name, cache_key)
+    if df_processed_dominance is None:
+        # Dominance dihitung dari cube bersama yang juga dipakai line chart dan API, jadi data hanya di-parse sekali.
+        cube = get_trade_cube()
+        if cube is None:
+            return pd.DataFrame(), []
+        unknown_reporters = missing_reporters(cube, reporter_pair)
+        if unknown_reporters:
+            st.error(missing_reporters_message(unknown_reporters))
+            return pd.DataFrame(), []
+        df_processed_dominance = compute_dominance_incrementally(cube, reporter_pair)
+        write_cached_frame(cache_name, cache_key, df_processed_dominance)
     
     available_years = sorted(df_processed_dominance['Year'].unique())
     if not available_years:
@@ -153,36 +531,233 @@ def load_trade_data():
         
     return df_processed_dominance, available_years
 
-@st.cache_data
+@st.cache_resource(max_entries=config.TRADE_STORE_MAX_ENTRIES)
+def load_trade_store(reporter_pair=config.DEFAULT_REPORTER_PAIR, data_version=None):
+    # Satu objek read-only per (pasangan reporter, versi data) yang dipakai bersama oleh semua sesi dan rerun:
+    # tidak ada pickle/unpickle atau salinan frame per pemanggilan seperti pada st.cache_data.
+    return build_trade_store(*compute_trade_data(reporter_pair))
+
+def build_trade_store(df_dominance, available_years):
+    # Skema ringkas, frame tabel beserta indeksnya, lalu semua array dibekukan (read-only).
+    if df_dominance.empty:
+        return TradeDataStore(df_dominance, available_years, pd.DataFrame(), {})
+    df_dominance = compact_frame(df_dominance)
+    df_table = compact_frame(prepare_table_data(df_dominance))
+    table_index = prepare_table_index(df_table)
+    for positions in table_index.values():
+        positions.flags.writeable = False
+    return TradeDataStore(
+        freeze_frame(df_dominance), [int(year) for year in available_years], freeze_frame(df_table), table_index
+    )
+
+def get_trade_store(reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    # get_data_version hanya membaca stat file, jadi data yang berubah di disk otomatis memuat store baru.
+    return load_trade_store(tuple(reporter_pair), get_data_version())
+
+def discard_trade_store(reporter_pair=config.DEFAULT_REPORTER_PAIR, data_version=None):
+    # Store kosong (file hilang, gagal dimuat) jangan bertahan sampai file berubah: buang dari cache agar dicoba lagi.
+    load_trade_store.clear(tuple(reporter_pair), data_version)
+    load_trade_cube.clear(data_version)
+
+def load_trade_data(reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    store = get_trade_store(reporter_pair)
+    return store.df_dominance, store.available_years
+
+def load_table_data(reporter_pair=config.DEFAULT_REPORTER_PAIR):
+    store = get_trade_store(reporter_pair)
+    return store.df_table, store.table_index
+
+def load_local_geojson():
+    try:
+        with gzip.open(config.GEOJSON_PATH, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        st.error(f"Failed to load local GeoJSON data '{config.GEOJSON_PATH}': {e}")
+        return None
+
+@st.cache_resource
 def get_geojson_data():
+    if not config.GEOJSON_URL:
+        return load_local_geojson()
     try:
-        response = requests.get(config.GEOJSON_URL)
+        response = requests.get(config.GEOJSON_URL, timeout=config.GEOJSON_TIMEOUT_SECONDS)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Failed to fetch GeoJSON data: {e}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        st.warning(f"Failed to fetch GeoJSON data, using the bundled geometry instead: {e}")
+        return load_local_geojson()
+
+def round_coordinates(coords, decimals):
+    if isinstance(coords[0], (int, float)):
+        return [round(c, decimals) for c in coords]
+    return [round_coordinates(c, decimals) for c in coords]
+
+def simplify_geojson(geojson, tolerance, grid_size):
+    decimals = max(0, -math.floor(math.log10(grid_size))) if grid_size else None
+    features = []
+    for feature in geojson['features']:
+        geometry = shape(feature['geometry'])
+        if tolerance:
+            geometry = geometry.simplify(tolerance, preserve_topology=True)
+        if grid_size:
+            # Pulau kecil bisa hilang saat di-snap ke grid; pakai hasil simplifikasi saja untuk kasus itu.
+            quantized = shapely.set_precision(geometry, grid_size)
+            if not quantized.is_empty:
+                geometry = quantized
+        geometry_json = mapping(geometry)
+        coordinates = geometry_json['coordinates']
+        if decimals is not None:
+            coordinates = round_coordinates(coordinates, decimals)
+        features.append({
+            **feature,
+            "geometry": {"type": geometry_json['type'], "coordinates": coordinates}
+        })
+    return {**geojson, "features": features}
+
+@st.cache_resource
+def get_geojson_levels():
+    geojson = get_geojson_data()
+    if geojson is None:
         return None
+    return {
+        level: simplify_geojson(geojson, **settings)
+        for level, settings in config.GEOMETRY_LEVELS.items()
+    }
+
+def select_geometry_level(selected_continent="World"):
+    # Level paling kasar yang toleransinya masih di bawah ukuran satu piksel pada tampilan ini.
+    lon_span = 360
+    if selected_continent in config.CONTINENT_BOUNDS:
+        bounds = config.CONTINENT_BOUNDS[selected_continent]
+        lon_span = bounds['lon_max'] - bounds['lon_min']
+    degrees_per_pixel = lon_span / config.MAP_WIDTH_PX
+    for level, settings in config.GEOMETRY_LEVELS.items():
+        if settings['tolerance'] <= degrees_per_pixel:
+            return level
+    return list(config.GEOMETRY_LEVELS)[-1]
+
+def get_geojson_for_view(selected_continent="World"):
+    geojson_levels = get_geojson_levels()
+    if geojson_levels is None:
+        return None
+    return geojson_levels[select_geometry_level(selected_continent)]
+
+def compute_map_matrices(df_dominance, geojson_data):
+    # Matriks (year x flow x feature) yang sejajar dengan urutan feature GeoJSON, sehingga
+    # setiap frame peta cukup mengambil satu irisan array. Feature di-join lewat id ISO3-nya.
+    country_dimension = get_country_dimension()
+    feature_ids = [str(feature.get('id')) for feature in geojson_data['features']]
+    feature_codes = country_codes_for_iso3(feature_ids)
+    feature_names = [
+        country_dimension.names[code] if code >= 0 else feature['properties']['name']
+        for code, feature in zip(feature_codes, geojson_data['features'])
+    ]
+    feature_positions_by_code = np.full(len(country_dimension.iso3), -1)
+    matched_features = feature_codes >= 0
+    feature_positions_by_code[feature_codes[matched_features]] = np.flatnonzero(matched_features)
+
+    years = np.array(sorted(df_dominance['Year'].unique()), dtype='int64')
+    flow_keys = [config.TRADE_FLOW_MAP[display_name] for display_name in config.TRADE_FLOW_OPTIONS_DISPLAY]
+    shape_3d = (len(years), len(flow_keys), len(feature_names))
+    ratio = np.full(shape_3d, np.nan)
+    reporter_a_trade = np.zeros(shape_3d)
+    reporter_b_trade = np.zeros(shape_3d)
+
+    # Beberapa nama mentah bisa dipetakan ke negara yang sama; baris terakhir yang dipakai.
+    df_map = df_dominance[df_dominance['Country_Code'].to_numpy() >= 0]
+    df_map = df_map.drop_duplicates(subset=['Country_Code', 'Year', 'Trade_Flow_Type'], keep='last')
+    feature_idx = feature_positions_by_code[df_map['Country_Code'].to_numpy()]
+    flow_idx = pd.Index(flow_keys).get_indexer(df_map['Trade_Flow_Type'])
+    year_idx = years.searchsorted(df_map['Year'].to_numpy())
+    matched = (feature_idx >= 0) & (flow_idx >= 0)
+    index = (year_idx[matched], flow_idx[matched], feature_idx[matched])
+    ratio[index] = df_map['Ratio'].to_numpy()[matched]
+    reporter_a_trade[index] = df_map['Reporter_A_Trade'].to_numpy()[matched]
+    reporter_b_trade[index] = df_map['Reporter_B_Trade'].to_numpy()[matched]
+
+    return {
+        'feature_ids': feature_ids,
+        'feature_names': feature_names,
+        'years': years,
+        'flow_keys': flow_keys,
+        'ratio': ratio,
+        'reporter_a_trade': reporter_a_trade,
+        'reporter_b_trade': reporter_b_trade
+    }
 
 @st.cache_data
+def prepare_map_matrices(df_dominance, geojson_data):
+    if df_dominance.empty or geojson_data is None:
+        return None
+    return compute_map_matrices(df_dominance, geojson_data)
+
 def prepare_table_data(df_dominance):
     if df_dominance.empty:
         return pd.DataFrame()
 
-    df_table_ready = df_dominance.copy()
-    df_table_ready['Total_US_China_Trade'] = df_table_ready['US_Trade'] + df_table_ready['China_Trade']
+    cache_key = compute_cache_key(
+        CACHE_FORMAT_VERSION, int(pd.util.hash_pandas_object(df_dominance, index=False).sum()), country_dimension_version()
+    )
+    df_cached_table = read_cached_frame("table", cache_key)
+    if df_cached_table is not None:
+        return df_cached_table
 
-    def get_continent_info(country_name):
-        return config.COUNTRY_TO_CONTINENT_MAP.get(country_name, ("Unknown", "Unknown"))
+    cols_to_keep = ['Partner', 'Year', 'Trade_Flow_Type', 'Ratio', 'Reporter_A_Trade', 'Reporter_B_Trade', 'Total_Pair_Trade', 'Continent_Code', 'Continent_Name']
+    # Hanya kolom yang dipakai tabel yang disalin dari frame dominance.
+    df_table_ready = df_dominance[[col for col in cols_to_keep if col in df_dominance.columns]].copy()
+    df_table_ready['Total_Pair_Trade'] = df_table_ready['Reporter_A_Trade'] + df_table_ready['Reporter_B_Trade']
 
-    continent_data = df_table_ready['Partner'].apply(lambda x: pd.Series(get_continent_info(x), index=['Continent_Code', 'Continent_Name']))
-    
-    df_table_ready = pd.concat([df_table_ready, continent_data], axis=1)
+    country_dimension = get_country_dimension()
+    country_codes = df_dominance['Country_Code'].to_numpy()
+    is_country = country_codes >= 0
+    df_table_ready['Continent_Code'] = np.where(is_country, country_dimension.continent_codes[country_codes], "Unknown")
+    df_table_ready['Continent_Name'] = np.where(is_country, country_dimension.continent_names[country_codes], "Unknown")
 
-    cols_to_keep = ['Partner', 'Year', 'Trade_Flow_Type', 'Ratio', 'US_Trade', 'China_Trade', 'Total_US_China_Trade', 'Continent_Code', 'Continent_Name']
     existing_cols = [col for col in cols_to_keep if col in df_table_ready.columns]
     
     if len(existing_cols) < len(cols_to_keep) -2 :
          st.warning("Beberapa kolom penting hilang saat menyiapkan data tabel. Tabel mungkin tidak lengkap.")
          return df_table_ready[existing_cols] if existing_cols else pd.DataFrame()
-        
-    return df_table_ready[existing_cols]
\ No newline at end of file
+
+    write_cached_frame("table", cache_key, df_table_ready[existing_cols])
+    return df_table_ready[existing_cols]
+
+TABLE_EXCLUDED_CONTINENT_CODES = ["Unknown", "Group", ""]
+
+def prepare_table_index(df_table_prepared):
+    # Posisi baris untuk setiap (Year, Trade_Flow_Type, Continent_Code), sudah terurut menurun
+    # berdasarkan Total_Pair_Trade. "World" berisi semua benua yang dikenal.
+    if df_table_prepared.empty:
+        return {}
+
+    totals = df_table_prepared['Total_Pair_Trade'].to_numpy()
+    df_keys = pd.DataFrame({
+        'Year': df_table_prepared['Year'].to_numpy(),
+        'Trade_Flow_Type': df_table_prepared['Trade_Flow_Type'].to_numpy(),
+        'Continent_Code': df_table_prepared['Continent_Code'].to_numpy(),
+        'Total_Pair_Trade': totals,
+    }).sort_values('Total_Pair_Trade', ascending=False, kind='mergesort')
+    sorted_positions = df_keys.index.to_numpy()
+
+    table_index = {}
+    for (year, flow_key, continent_code), group_positions in df_keys.groupby(['Year', 'Trade_Flow_Type', 'Continent_Code'], sort=False).indices.items():
+        table_index[(int(year), flow_key, continent_code)] = sorted_positions[group_positions]
+
+    df_world_keys = df_keys[~df_keys['Continent_Code'].isin(TABLE_EXCLUDED_CONTINENT_CODES)]
+    world_positions = df_world_keys.index.to_numpy()
+    for (year, flow_key), group_positions in df_world_keys.groupby(['Year', 'Trade_Flow_Type'], sort=False).indices.items():
+        table_index[(int(year), flow_key, "World")] = world_positions[group_positions]
+
+    # Jika ada partner dengan total > 0, hanya partner tersebut yang diperingkat.
+    for key, positions in table_index.items():
+        non_zero_positions = positions[totals[positions] > 0]
+        if len(non_zero_positions) > 0:
+            table_index[key] = non_zero_positions
+    return table_index
+
+def get_top_partners(df_table_prepared, table_index, year, flow_key, continent_code, ascending=False, top_n=config.TOP_N_COUNTRIES):
+    positions = table_index.get((int(year), flow_key, continent_code))
+    if positions is None:
+        return df_table_prepared.iloc[0:0]
+    selected_positions = positions[::-1][:top_n] if ascending else positions[:top_n]
+    return df_table_prepared.iloc[selected_positions]
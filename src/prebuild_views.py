@@ -0,0 +1,131 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import streamlit as st
+import streamlit.logger
+
+# Tanpa runtime Streamlit setiap dekorator dan pemanggilan cache mencetak peringatan; cukup tampilkan error.
+# Diatur sebelum modul app diimpor karena dekorator cache sudah memeriksa runtime saat impor.
+st.config.set_option("logger.level", "error")
+streamlit.logger.set_log_level("error")
+
+import config
+import data_loader
+from components import map_plotter, line_chart_plotter, table_plotter, prebuilt_views
+
+# Merender semua kombinasi view dashboard sebelumnya (dijalankan dari root repo: python src/prebuild_views.py).
+# Setiap figure peta/tren dan setiap tabel (tahun x benua x flow x urutan) ditulis sebagai artefak JSON
+# dengan hash isi di nama file; manifest.json ditulis terakhir sehingga app tidak pernah melihat build setengah jadi.
+
+def render_map(reporter_pair, flow_key):
+    df_dominance, available_years = data_loader.load_trade_data(reporter_pair)
+    geojson_data = data_loader.get_geojson_for_view("World")
+    # App selalu membuka peta di tahun terakhir; slider berpindah tahun di sisi klien.
+    year = max(available_years)
+    fig = map_plotter.create_choropleth_map(
+        df_dominance, available_years, geojson_data, min(available_years), max(available_years),
+        current_selected_year=year, selected_flow_key=flow_key, selected_continent="World",
+        reporter_pair=reporter_pair
+    )
+    return [(prebuilt_views.map_view_key(flow_key, year), "map", fig.to_json())]
+
+def render_line_chart(reporter_pair, view):
+    df_trend = line_chart_plotter.load_line_chart_data(reporter_pair, data_loader.get_data_version())
+    fig = line_chart_plotter.create_trade_trend_line_chart(df_trend, view, reporter_pair)
+    return [(prebuilt_views.line_chart_view_key(view), "line_chart", fig.to_json())]
+
+def render_tables(reporter_pair, year):
+    df_table, table_index = data_loader.load_table_data(reporter_pair)
+    artifacts = []
+    for continent_code in config.CONTINENT_OPTIONS.values():
+        for flow_key in config.TRADE_FLOW_MAP.values():
+            for sort_order in config.SORT_ORDER_OPTIONS:
+                df_top_n = data_loader.get_top_partners(
+                    df_table, table_index, year=year, flow_key=flow_key, continent_code=continent_code,
+                    ascending=(sort_order == "Ascending"), top_n=config.TOP_N_COUNTRIES
+                )
+                payload = json.dumps(
+                    {"html": table_plotter.generate_trade_table_html(df_top_n, reporter_pair), "row_count": len(df_top_n)},
+                    separators=(',', ':')
+                )
+                artifacts.append((prebuilt_views.table_view_key(year, continent_code, flow_key, sort_order), "table", payload))
+    return artifacts
+
+def run_task(task):
+    render, args = task
+    return render(*args)
+
+def build_tasks(reporter_pair, available_years):
+    tasks = [(render_map, (reporter_pair, flow_key)) for flow_key in config.TRADE_FLOW_MAP.values()]
+    # Semua view tren ada di satu figure (tombol sisi klien), jadi cukup satu artefak untuk view awal.
+    tasks += [(render_line_chart, (reporter_pair, config.DEFAULT_LINE_CHART_VIEW))]
+    tasks += [(render_tables, (reporter_pair, year)) for year in available_years]
+    return tasks
+
+def write_artifact(output_dir, kind, payload):
+    data = payload.encode("utf-8")
+    artifact_name = f"{kind}-{hashlib.sha256(data).hexdigest()[:16]}.json"
+    artifact_path = os.path.join(output_dir, artifact_name)
+    # Nama berbasis isi: artefak yang sudah ada pasti sama persis dan tidak perlu ditulis ulang.
+    if not os.path.exists(artifact_path):
+        with open(artifact_path, "wb") as f:
+            f.write(data)
+    return artifact_name, len(data)
+
+def write_manifest(output_dir, manifest):
+    manifest_path = os.path.join(output_dir, prebuilt_views.MANIFEST_NAME)
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+def prune_artifacts(output_dir, keep_names):
+    removed = 0
+    for name in os.listdir(output_dir):
+        if name.endswith(".json") and name != prebuilt_views.MANIFEST_NAME and name not in keep_names:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every dashboard view ahead of time into content-hashed JSON artifacts.")
+    parser.add_argument("--output", default=config.PREBUILT_VIEWS_DIR)
+    parser.add_argument("--workers", type=int, default=config.PREBUILD_WORKERS)
+    parser.add_argument("--keep-stale", action="store_true", help="Do not delete artifacts that the new manifest no longer references.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reporter_pair = config.DEFAULT_REPORTER_PAIR
+    # Store dimuat sekali di proses induk agar cache disk terisi sebelum worker dimulai.
+    df_dominance, available_years = data_loader.load_trade_data(reporter_pair)
+    if df_dominance.empty or not available_years:
+        print("No trade data available; nothing to prebuild.", file=sys.stderr)
+        return 1
+    source_version = prebuilt_views.prebuild_source_version(reporter_pair)
+
+    os.makedirs(args.output, exist_ok=True)
+    views = {}
+    total_bytes = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for artifacts in executor.map(run_task, build_tasks(reporter_pair, available_years)):
+            for view_key, kind, payload in artifacts:
+                views[view_key], size = write_artifact(args.output, kind, payload)
+                total_bytes += size
+
+    write_manifest(args.output, {
+        "format": prebuilt_views.PREBUILT_FORMAT_VERSION,
+        "source_version": source_version,
+        "reporter_pair": list(reporter_pair),
+        "views": views,
+    })
+    removed = 0 if args.keep_stale else prune_artifacts(args.output, set(views.values()))
+    print(f"Prebuilt {len(views)} views ({len(set(views.values()))} artifacts, {total_bytes / 1024 ** 2:.1f} MB) "
+          f"into {args.output} in {time.perf_counter() - start:.1f}s; removed {removed} stale artifacts.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())